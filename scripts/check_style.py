@@ -15,30 +15,44 @@ rules/*.md に定義されたルールに基づいてファイルを検証しま
 
 import argparse
 import ast
+import atexit
+import fnmatch
+import functools
 import hashlib
+import io
+import itertools
 import json
 import math
 import os
-import random
+import queue
 import re
+import secrets
 import shutil
-import string
 import subprocess
 import sys
+import tempfile
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass, field
-from fnmatch import fnmatch
 from pathlib import Path
 from uuid import uuid4
 
+try:
+    import orjson
+except ImportError:  # orjson は任意依存です。未インストールなら標準の json を使います。
+    orjson = None
 
+
+# v6: ファイルに依存しない部分 (指示、チェックリスト、ルール本文、suppressions) を先頭にまとめ、
+# 同じルールのプロンプト間で接頭辞が一致するようにしています (claude 側のプロンプト キャッシュが効きます)。
+# v5: diff モードでは大きなファイルの全文の代わりに変更箇所周辺の抜粋を送ります。
 # v4: 全モードで per-file 単位 (1 ルール × 1 ファイル) の並列実行に統一しています。
 # v3 は hook がルール単位、ストリームが per-file でした。v2 は全ルール一括、v1 はファイル単位でした。
-PROMPT_VERSION = "4"
+PROMPT_VERSION = "6"
 VIOLATION_STATUS_SCHEMA_VERSION = "1"
 DEFAULT_LEASE_TTL_SECONDS = 300
 DEFAULT_LEASE_GRACE_PERIOD_SECONDS = 30
@@ -68,12 +82,35 @@ MIN_FUTURE_TIMEOUT_SECONDS = 10
 MAX_STREAM_RESULTS_DIRS = 5
 # ストリーム モードの deadline (秒) です。hook 外で実行するため長めに設定しています。
 STREAM_DEADLINE_SECONDS = 3600
+# ストリーム モードで status.json を書き直す最短間隔 (秒) です。
+STATUS_FLUSH_INTERVAL_SECONDS = 0.5
 # claude -p の同時起動数のデフォルト上限です。.complete-validator/config.json で上書きできます。
 DEFAULT_MAX_WORKERS = 4
 # claude -p で使用するデフォルト モデルです。.complete-validator/config.json で上書きできます。
 DEFAULT_MODEL = "sonnet"
 # キャッシュ TTL のデフォルト (秒) です。既定は 7 日です。
 DEFAULT_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+# キャッシュに残すエントリ数のデフォルト上限です。超えた分は最終参照が古い順に削除します。
+DEFAULT_CACHE_MAX_ENTRIES = 5000
+# キャッシュ ディレクトリの掃除 (prune) を行う最短間隔 (秒) です。
+CACHE_PRUNE_INTERVAL_SECONDS = 24 * 60 * 60
+# diff モードで文脈として送る、各 hunk の前後の行数です。
+DIFF_CONTEXT_WINDOW_LINES = 50
+# この行数以下のファイルは、diff モードでも文脈として全文を送ります。
+DIFF_CONTEXT_MIN_FILE_LINES = 400
+# ルール キャッシュ (rules-cache.json) の形式バージョンです。パース仕様を変えたら上げます。
+RULES_CACHE_VERSION = "2"
+# 作業ツリーのファイルやルール ファイルを並列に読み込むスレッド数の上限です。
+FILE_READ_MAX_WORKERS = 32
+# 内容を読まずにバイナリとみなす拡張子です (小文字で比較します)。
+BINARY_FILE_SUFFIXES = frozenset({
+    ".png", ".jpg", ".jpeg", ".gif", ".ico", ".pdf", ".zip", ".gz", ".whl",
+    ".so", ".dylib", ".dll", ".exe", ".class", ".jar", ".pyc",
+})
+# バイナリ判定のために先頭から読むバイト数です。この範囲に NUL があればバイナリとみなします。
+BINARY_SNIFF_BYTES = 8192
+# この時間内に更新されたファイルはスタンプを信用せず、blob ID を記録しません。
+FILE_DIGEST_RACY_WINDOW_NS = 2 * 1_000_000_000
 DEFAULT_RULE_CONFIG_VERSION = 1
 DEFAULT_WATCH_INTERVAL_SECONDS = 1.0
 DEFAULT_WATCH_DEBOUNCE_SECONDS = 0.5
@@ -169,11 +206,9 @@ def load_rule_config(config_dir: Path) -> dict:
         正規化済み rule-config 辞書です。
     """
     config_path = _rule_config_path(config_dir)
-    if not config_path.exists():
-        return _default_rule_config()
     try:
-        raw = json.loads(config_path.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, OSError):
+        raw = _load_json(config_path.read_bytes())
+    except (json.JSONDecodeError, OSError, UnicodeDecodeError):
         return _default_rule_config()
     return _normalize_rule_config(raw)
 
@@ -194,7 +229,7 @@ def save_rule_config(config_dir: Path, rule_config: dict) -> Path:
         保存先ファイルパスです。
     """
     config_path = _rule_config_path(config_dir)
-    _write_json_atomically(config_path, _normalize_rule_config(rule_config))
+    _write_json_atomically(config_path, _normalize_rule_config(rule_config), indent=True)
     return config_path
 
 
@@ -307,12 +342,10 @@ def load_config(config_dir: Path) -> dict:
     else:
         config_path = config_dir / ".complete-validator" / "config.json"
 
-    if config_path.exists():
-        try:
-            return json.loads(config_path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
-            return {}
-    return {}
+    try:
+        return _load_json(config_path.read_bytes())
+    except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+        return {}
 
 
 def get_max_workers(config: dict) -> int:
@@ -372,6 +405,25 @@ def get_cache_ttl_seconds(config: dict) -> int:
     return DEFAULT_CACHE_TTL_SECONDS
 
 
+def get_cache_max_entries(config: dict) -> int:
+    """config から cache_max_entries を取得します。未設定時は DEFAULT_CACHE_MAX_ENTRIES を返します。
+
+    Parameters
+    ----------
+    config: dict
+        ``load_config()`` で読み込んだ設定の辞書です。
+
+    Returns
+    -------
+    int
+        キャッシュに残すエントリ数の上限です。
+    """
+    value = config.get("cache_max_entries", DEFAULT_CACHE_MAX_ENTRIES)
+    if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+        return value
+    return DEFAULT_CACHE_MAX_ENTRIES
+
+
 def get_cache_enabled(config: dict) -> bool:
     value = config.get("cache", True)
     if isinstance(value, bool):
@@ -395,23 +447,42 @@ def get_batching_enabled(config: dict) -> bool:
 
 @dataclass
 class CacheStore:
-    """JSON ファイルに永続化されるキャッシュ ストアです。
+    """キー単位のファイルに永続化されるキャッシュ ストアです。
+
+    エントリは ``<path>/<キー先頭 2 文字>/<キー>.json`` に 1 件ずつ保存します。
+    ``put`` はメモリーを更新してファイル書き込みをバックグラウンドの書き込みスレッドに
+    任せ、``get`` はメモリー上にないキーだけをディスクから遅延読み込みします。
+    書き込みとエントリ削除は 1 本のキューを順に処理するため、同じキーへの操作の順序は保たれます。
+    未完了の書き込みは ``flush`` (プロセス終了時にも自動で呼ばれます) で待ち合わせます。
+    TTL は最終参照からの期間です。参照したエントリはメモリー上の ``accessed_at`` とファイルの mtime を
+    更新し、``get`` と ``prune`` はどちらも最終参照から TTL を過ぎたエントリを期限切れとして扱います。
+    ``prune`` は ``max_entries`` を超えた最終参照の古いエントリも削除します。
 
     Parameters
     ----------
     path: Path
-        キャッシュ JSON ファイルのパスです。
+        キャッシュ ディレクトリのパスです。
     """
 
     path: Path
     ttl_seconds: int = DEFAULT_CACHE_TTL_SECONDS
+    max_entries: int = DEFAULT_CACHE_MAX_ENTRIES
     _data: dict = field(default_factory=dict, repr=False)
     _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _pending: queue.Queue = field(default_factory=queue.Queue, repr=False)
+    _writer: threading.Thread | None = field(default=None, repr=False)
 
     def _current_ts(self) -> float:
         return time.time()
 
     def _is_expired(self, entry: dict, now_ts: float) -> bool:
+        """最終参照 (``accessed_at``) から TTL を過ぎていれば ``True`` を返します。
+
+        ``accessed_at`` を持たない旧形式のエントリは、記録済みの ``expires_at`` で判定します。
+        """
+        accessed_at = entry.get("accessed_at")
+        if accessed_at is not None:
+            return float(accessed_at) + self.ttl_seconds <= now_ts
         expires_at = entry.get("expires_at")
         if expires_at is None:
             return False
@@ -421,71 +492,190 @@ class CacheStore:
             return False
 
     def _make_entry(self, value: str, now_ts: float) -> dict:
-        return {
-            "value": value,
-            "cached_at": now_ts,
-            "expires_at": now_ts + self.ttl_seconds,
-        }
+        """ファイルに書き出すエントリです。最終参照時刻はファイルの mtime で表します。"""
+        return {"value": value, "cached_at": now_ts}
 
-    def _persist_locked(self) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.path.write_text(
-            json.dumps(self._data, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+    def _shard_path(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}.json"
+
+    def _read_entry(self, key: str) -> dict | None:
+        """*key* のエントリ ファイルを読み込みます。存在しないか破損している場合は ``None`` を返します。
+
+        ファイルの mtime を最終参照時刻 (``accessed_at``) としたメモリー上のエントリを返します。
+        """
+        try:
+            with open(self._shard_path(key), "rb") as handle:
+                accessed_at = os.fstat(handle.fileno()).st_mtime
+                raw = _load_json(handle.read())
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+            return None
+        if not isinstance(raw, dict) or not isinstance(raw.get("value"), str):
+            return None
+        return {"value": raw["value"], "accessed_at": accessed_at}
+
+    def _write_entry(self, key: str, entry: dict, shard_dirs: set[Path] | None = None) -> None:
+        """*key* のエントリ ファイルを一時ファイル経由で原子的に書き込みます。
+
+        *shard_dirs* を渡すと、作成済みのシャード ディレクトリを記録して ``mkdir`` を 1 回に抑えます。
+        """
+        shard_path = self._shard_path(key)
+        if shard_dirs is None or shard_path.parent not in shard_dirs:
+            shard_path.parent.mkdir(parents=True, exist_ok=True)
+            if shard_dirs is not None:
+                shard_dirs.add(shard_path.parent)
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=shard_path.parent, prefix=f".{key}.", suffix=".tmp", delete=False,
+        ) as handle:
+            handle.write(_dump_json(entry))
+        os.replace(handle.name, shard_path)
+
+    def _remove_entry(self, key: str) -> None:
+        try:
+            self._shard_path(key).unlink()
+        except OSError:
+            pass
+
+    def _touch_entry(self, key: str, now_ts: float) -> None:
+        """*key* のエントリ ファイルの mtime を *now_ts* にし、最終参照時刻として記録します。"""
+        try:
+            os.utime(self._shard_path(key), (now_ts, now_ts))
+        except OSError:
+            pass
+
+    def _enqueue(self, key: str, entry: dict | None) -> None:
+        """書き込みスレッドに *entry* の書き込み (``None`` なら削除) を依頼します。"""
+        # 書き込みスレッドの起動後はロックを取らず、キューへ積むだけにします。
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._drain, name="cache-writer", daemon=True)
+                    self._writer.start()
+                    atexit.register(self.flush)
+        self._pending.put((key, entry))
+
+    def _drain(self) -> None:
+        shard_dirs: set[Path] = set()
+        while True:
+            # 溜まっている依頼をまとめて取り出し、同じキーへの依頼は最後の 1 件だけを反映します。
+            batch = [self._pending.get()]
+            while True:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                for key, entry in dict(batch).items():
+                    try:
+                        if entry is None:
+                            self._remove_entry(key)
+                        else:
+                            self._write_entry(key, entry, shard_dirs)
+                    except Exception:
+                        # キャッシュは最適化なので、書き込めなくてもチェック結果には影響しません。
+                        # 想定外の例外でもスレッドを止めず、次の依頼を処理します。
+                        shard_dirs.clear()
+            finally:
+                # flush (atexit) が join で止まらないよう、完了の通知は必ず行います。
+                for _ in batch:
+                    self._pending.task_done()
+
+    def flush(self) -> None:
+        """依頼済みの書き込みと削除がすべてディスクに反映されるまで待ちます。"""
+        self._pending.join()
 
     def load(self) -> None:
-        """ディスクからキャッシュ内容をメモリーに読み込みます。
+        """旧形式の単一ファイル キャッシュ (``<path>.json``) が残っていれば、キー単位のファイルへ移行します。
 
-        ファイルが存在しないか破損している場合は空のキャッシュで開始します。
+        移行後は旧ファイルを削除します。破損している場合は移行せずに削除します。
+        エントリ本体は ``get`` 時に遅延読み込みするため、ここでは読み込みません。
+        前回の掃除から ``CACHE_PRUNE_INTERVAL_SECONDS`` 以上経っていれば ``prune`` も実行します。
         """
-        if not self.path.exists():
+        self._migrate_legacy_file()
+        self._prune_if_due()
+
+    def _migrate_legacy_file(self) -> None:
+        legacy_path = self.path.with_suffix(".json")
+        if not legacy_path.is_file():
             return
         try:
-            raw = json.loads(self.path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
-            self._data = {}
-            return
+            raw = _load_json(legacy_path.read_bytes())
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+            raw = {}
 
-        if not isinstance(raw, dict):
-            self._data = {}
-            return
+        now_ts = self._current_ts()
+        if isinstance(raw, dict):
+            for key, value in raw.items():
+                if isinstance(value, str):
+                    entry = self._make_entry(value, now_ts)
+                elif isinstance(value, dict) and "value" in value:
+                    entry = dict(value)
+                    if not isinstance(entry["value"], str):
+                        entry["value"] = str(entry["value"])
+                    entry.setdefault("cached_at", now_ts)
+                    entry.setdefault("expires_at", now_ts + self.ttl_seconds)
+                else:
+                    continue
+                if self._is_expired(entry, now_ts):
+                    continue
+                self._write_entry(key, entry)
+
+        try:
+            legacy_path.unlink()
+        except OSError:
+            pass
+
+    def _prune_if_due(self) -> None:
+        stamp_path = self.path / ".last-prune"
+        try:
+            if self._current_ts() - stamp_path.stat().st_mtime < CACHE_PRUNE_INTERVAL_SECONDS:
+                return
+        except OSError:
+            if not self.path.is_dir():
+                return
+        self.prune()
+        try:
+            stamp_path.touch()
+        except OSError:
+            pass
+
+    def prune(self) -> int:
+        """最終参照 (ファイルの mtime) から TTL を過ぎたエントリと、``max_entries`` を超えた分の古いエントリを削除します。
 
+        Returns
+        -------
+        int
+            削除したエントリ数です。
+        """
         now_ts = self._current_ts()
-        normalized: dict[str, dict] = {}
-        changed = False
-        for key, value in raw.items():
-            if isinstance(value, str):
-                normalized[key] = self._make_entry(value, now_ts)
-                changed = True
-                continue
-            if not isinstance(value, dict):
-                changed = True
-                continue
-            if "value" not in value:
-                changed = True
+        entries: list[tuple[float, str]] = []
+        try:
+            shards = [entry for entry in os.scandir(self.path) if entry.is_dir(follow_symlinks=False)]
+        except OSError:
+            return 0
+        for shard in shards:
+            try:
+                with os.scandir(shard.path) as it:
+                    for entry in it:
+                        if entry.name.startswith(".") or not entry.name.endswith(".json"):
+                            continue
+                        try:
+                            entries.append((entry.stat().st_mtime, entry.path))
+                        except OSError:
+                            continue
+            except OSError:
                 continue
-            entry_value = value.get("value", "")
-            if not isinstance(entry_value, str):
-                entry_value = str(entry_value)
-                changed = True
-            entry = dict(value)
-            entry["value"] = entry_value
-            if self._is_expired(entry, now_ts):
-                changed = True
+
+        entries.sort(reverse=True)
+        removed = 0
+        for index, (mtime, entry_path) in enumerate(entries):
+            if index < self.max_entries and mtime + self.ttl_seconds > now_ts:
                 continue
-            if "cached_at" not in entry:
-                entry["cached_at"] = now_ts
-                changed = True
-            if "expires_at" not in entry:
-                entry["expires_at"] = now_ts + self.ttl_seconds
-                changed = True
-            normalized[key] = entry
-
-        self._data = normalized
-        if changed:
-            with self._lock:
-                self._persist_locked()
+            try:
+                os.unlink(entry_path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
 
     def get(self, key: str) -> str | None:
         """*key* に対応するキャッシュ値を返します。ミス時は ``None`` を返します。
@@ -500,20 +690,55 @@ class CacheStore:
         str | None
             キャッシュされた値、またはミス時は ``None`` です。
         """
+        return self.multi_get([key])[0]
+
+    def multi_get(self, keys: list[str]) -> list[str | None]:
+        """複数のキーをまとめて引きます。メモリー上の参照はロック 1 回で済ませます。
+
+        Parameters
+        ----------
+        keys: list[str]
+            キャッシュ キーのリストです。
+
+        Returns
+        -------
+        list[str | None]
+            *keys* と同じ順序の値のリストです。ミスしたキーは ``None`` です。
+        """
         with self._lock:
-            entry = self._data.get(key)
-            if not isinstance(entry, dict):
-                return None
-            now_ts = self._current_ts()
-            if self._is_expired(entry, now_ts):
-                self._data.pop(key, None)
-                self._persist_locked()
-                return None
-            value = entry.get("value")
-            return value if isinstance(value, str) else None
+            entries = [self._data.get(key) for key in keys]
+
+        for index, key in enumerate(keys):
+            if entries[index] is None:
+                entries[index] = self._read_entry(key)
+
+        now_ts = self._current_ts()
+        values: list[str | None] = []
+        expired: list[str] = []
+        accessed: dict[str, dict] = {}
+        for key, entry in zip(keys, entries):
+            if entry is None:
+                values.append(None)
+            elif self._is_expired(entry, now_ts):
+                expired.append(key)
+                values.append(None)
+            else:
+                accessed[key] = {"value": entry["value"], "accessed_at": now_ts}
+                values.append(entry["value"])
+        if accessed or expired:
+            with self._lock:
+                self._data.update(accessed)
+                for key in expired:
+                    self._data.pop(key, None)
+        for key in expired:
+            self._enqueue(key, None)
+        # 参照したエントリはファイルの mtime も進め、prune と同じ最終参照時刻にそろえます。
+        for key in accessed:
+            self._touch_entry(key, now_ts)
+        return values
 
     def put(self, key: str, value: str) -> None:
-        """*key* に *value* を格納し、ディスクに永続化します。
+        """*key* に *value* を格納し、該当エントリのファイル書き込みを書き込みスレッドに依頼します。
 
         Parameters
         ----------
@@ -522,16 +747,108 @@ class CacheStore:
         value: str
             キャッシュする値 (バリデーション結果) です。
         """
+        now_ts = self._current_ts()
+        with self._lock:
+            self._data[key] = {"value": value, "accessed_at": now_ts}
+        self._enqueue(key, self._make_entry(value, now_ts))
+
+
+def _git_blob_id(data: bytes) -> str:
+    """``git hash-object`` と同じ方式で blob ID (SHA1) を計算します。
+
+    Parameters
+    ----------
+    data: bytes
+        ファイルの内容です。
+
+    Returns
+    -------
+    str
+        blob ID (16 進文字列) です。
+    """
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+@dataclass
+class FileDigestCache:
+    """作業ツリー ファイルの blob ID を ``(path, mtime_ns, size)`` で記憶するキャッシュです。
+
+    スタンプが一致すればファイルを読まずに blob ID を返します。
+    更新直後のファイルは同じスタンプのまま内容が変わりうるため記録しません (git の racy-clean 対策と同じです)。
+
+    Parameters
+    ----------
+    path: Path
+        永続化先の JSON ファイルのパスです。
+    """
+
+    path: Path
+    _entries: dict = field(default_factory=dict, repr=False)
+    _dirty: bool = False
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def load(self) -> None:
+        """ディスクから記録を読み込みます。ファイルが存在しないか破損している場合は空で開始します。"""
+        raw = _read_json_file(self.path)
+        if not isinstance(raw, dict):
+            return
+        self._entries = {
+            key: value for key, value in raw.items()
+            if isinstance(value, list) and len(value) == 3
+        }
+
+    def save(self) -> None:
+        """記録に変更があればディスクに書き出します。"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+        _write_json_atomically(self.path, entries, durable=False)
+
+    def digest_for(self, file_path: str, mtime_ns: int, size: int, data: bytes) -> str:
+        """読み込み済みの *data* に対応する blob ID を返します。スタンプが一致すればハッシュを省きます。
+
+        スタンプは *data* を読む前後で変わらなかったことを呼び出し元が確かめたものを渡します。
+        読み込みとは別にファイルを開き直さないため、途中で編集されても blob ID と内容がずれません。
+
+        Parameters
+        ----------
+        file_path: str
+            作業ツリー上のファイル パスです。
+        mtime_ns: int
+            *data* を読んだときのファイルの更新時刻 (ナノ秒) です。
+        size: int
+            *data* を読んだときのファイル サイズです。
+        data: bytes
+            ファイルから読み込んだバイト列そのものです。
+
+        Returns
+        -------
+        str
+            blob ID です。
+        """
         with self._lock:
-            now_ts = self._current_ts()
-            self._data[key] = self._make_entry(value, now_ts)
-            self._persist_locked()
+            entry = self._entries.get(file_path)
+        if entry and entry[0] == mtime_ns and entry[1] == size:
+            return entry[2]
+
+        digest = _git_blob_id(data)
+        if time.time_ns() - mtime_ns >= FILE_DIGEST_RACY_WINDOW_NS:
+            with self._lock:
+                self._entries[file_path] = [mtime_ns, size, digest]
+                self._dirty = True
+        return digest
 
 
 @dataclass
 class StreamStatusTracker:
     """ストリーム モードの進捗を追跡し、status.json に書き出します。
 
+    ユニット完了ごとの記録は ``events.jsonl`` への 1 行追記だけにし、status.json の
+    全体書き換えは ``STATUS_FLUSH_INTERVAL_SECONDS`` ごとに 1 回へまとめます。
+    全ユニット完了時と ``mark_completed`` では即座に書き出します。
+
     Parameters
     ----------
     results_dir: Path
@@ -546,6 +863,8 @@ class StreamStatusTracker:
     _summary: dict = field(default_factory=lambda: {"allow": 0, "deny": 0, "error": 0, "pending": 0})
     _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
     _started_at: str = field(default_factory=lambda: time.strftime("%Y-%m-%dT%H:%M:%S%z"))
+    _events_file: object = field(default=None, repr=False)
+    _flush_timer: threading.Timer | None = field(default=None, repr=False)
 
     def __post_init__(self) -> None:
         """pending カウントを初期化し、初期ステータスを書き出します。"""
@@ -553,31 +872,77 @@ class StreamStatusTracker:
         self._write_status("running")
 
     def update(self, status: str) -> None:
-        """1 ユニットの完了を記録し、status.json を更新します。
+        """1 ユニットの完了を記録します。status.json の更新はまとめて行います。
 
         Parameters
         ----------
         status: str
             ユニットの結果 (``"allow"``、``"deny"``、``"error"``) です。
         """
+        self.update_batch([status])
+
+    def update_batch(self, statuses: list[str]) -> None:
+        """複数ユニットの完了を 1 回のロックと 1 回の events.jsonl 追記で記録します。
+
+        Parameters
+        ----------
+        statuses: list[str]
+            各ユニットの結果 (``"allow"``、``"deny"``、``"error"``) のリストです。
+        """
+        if not statuses:
+            return
         with self._lock:
-            self._completed += 1
-            self._summary[status] = self._summary.get(status, 0) + 1
+            self._completed += len(statuses)
+            for status in statuses:
+                self._summary[status] = self._summary.get(status, 0) + 1
             self._summary["pending"] = self.total_units - self._completed
-            overall = "completed" if self._completed >= self.total_units else "running"
-            self._write_status(overall)
+            self._append_events(statuses)
+            if self._completed >= self.total_units:
+                self._cancel_flush_locked()
+                self._write_status("completed")
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(STATUS_FLUSH_INTERVAL_SECONDS, self._flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
 
     def mark_completed(self) -> None:
         """ストリームを完了状態にします。"""
-        self._write_status("completed")
+        with self._lock:
+            self._cancel_flush_locked()
+            self._write_status("completed", indent=True)
+            if self._events_file is not None:
+                self._events_file.close()
+                self._events_file = None
+
+    def _flush(self) -> None:
+        """タイマーから呼ばれ、溜まった進捗を status.json に書き出します。"""
+        with self._lock:
+            if self._flush_timer is None:
+                return
+            self._flush_timer = None
+            self._write_status("running")
+
+    def _cancel_flush_locked(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
 
-    def _write_status(self, overall_status: str) -> None:
-        """結果ディレクトリに status.json を書き出します。
+    def _append_events(self, statuses: list[str]) -> None:
+        """events.jsonl にユニット完了イベントを 1 件 1 行で、まとめて 1 回の write で追記します。"""
+        if self._events_file is None:
+            self._events_file = open(self.results_dir / "events.jsonl", "ab", buffering=0)
+        ts = time.time()
+        self._events_file.write(b"".join(_dump_json({"ts": ts, "status": status}) + b"\n" for status in statuses))
+
+    def _write_status(self, overall_status: str, indent: bool = False) -> None:
+        """結果ディレクトリに status.json を原子的に書き出します。
 
         Parameters
         ----------
         overall_status: str
             全体のステータス (``"running"``、``"completed"``) です。
+        indent: bool
+            ``True`` なら JSON をインデントします。途中経過では詰めて出力します。
         """
         status_data = {
             "stream_id": self.results_dir.name,
@@ -589,10 +954,9 @@ class StreamStatusTracker:
             "summary": dict(self._summary),
         }
         status_path = self.results_dir / "status.json"
-        status_path.write_text(
-            json.dumps(status_data, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        tmp_path = status_path.with_suffix(".tmp")
+        tmp_path.write_bytes(_dump_json(status_data, indent=indent))
+        os.replace(tmp_path, status_path)
 
 
 def generate_stream_id() -> str:
@@ -601,10 +965,10 @@ def generate_stream_id() -> str:
     Returns
     -------
     str
-        ``YYYYMMDD-HHMMSS-<random6>`` 形式の ID です。
+        ``YYYYMMDD-HHMMSS-<random6>`` 形式の ID です。サフィックスは 16 進 6 文字です。
     """
     timestamp = time.strftime("%Y%m%d-%H%M%S")
-    suffix = "".join(random.choices(string.ascii_lowercase + string.digits, k=6))
+    suffix = secrets.token_hex(3)
     return f"{timestamp}-{suffix}"
 
 
@@ -616,20 +980,24 @@ def cleanup_old_stream_results(base_dir: Path) -> None:
     base_dir: Path
         ``.complete-validator/stream-results/`` ディレクトリのパスです。
     """
-    if not base_dir.exists():
+    try:
+        with os.scandir(base_dir) as it:
+            dir_names = sorted((entry.name for entry in it if entry.is_dir()), reverse=True)
+    except OSError:
         return
-    dirs = sorted(
-        [d for d in base_dir.iterdir() if d.is_dir()],
-        key=lambda d: d.name,
-        reverse=True,
-    )
-    for old_dir in dirs[MAX_STREAM_RESULTS_DIRS:]:
-        shutil.rmtree(old_dir, ignore_errors=True)
+    for old_name in dir_names[MAX_STREAM_RESULTS_DIRS:]:
+        shutil.rmtree(base_dir / old_name, ignore_errors=True)
 
 
-def _repository_root() -> Path:
+@functools.lru_cache(maxsize=None)
+def _repository_root_for(cwd: str) -> Path:
     git_toplevel = run_git("rev-parse", "--show-toplevel")
-    return Path(git_toplevel) if git_toplevel else Path.cwd()
+    return Path(git_toplevel) if git_toplevel else Path(cwd)
+
+
+def _repository_root() -> Path:
+    """git toplevel (git 管理外なら CWD) を返します。``git rev-parse`` は CWD ごとに 1 回だけ実行します。"""
+    return _repository_root_for(os.getcwd())
 
 
 def _safe_filename(name: str) -> str:
@@ -672,7 +1040,9 @@ def _severity_priority(severity: str) -> int:
     return 500
 
 
+@functools.lru_cache(maxsize=4096)
 def _build_violation_id(rule_id: str, canonical_file_path: str) -> str:
+    # 同じ (ルール, ファイル) の組は、結果レコードとキュー状態の更新で繰り返し ID を求めるため記憶します。
     return hashlib.sha256(f"{rule_id}\n{canonical_file_path}".encode("utf-8")).hexdigest()
 
 
@@ -687,15 +1057,62 @@ def _queue_state_path(queue_dir: Path, violation_id: str, status: ViolationStatu
     return queue_dir / filename
 
 
-def _write_json_atomically(path: Path, payload: dict) -> None:
+def _dump_json(payload: object, indent: bool = False) -> bytes:
+    """*payload* を UTF-8 の JSON バイト列にします。orjson があれば使います。
+
+    Parameters
+    ----------
+    payload: object
+        書き出す値です。
+    indent: bool
+        ``True`` なら 2 スペースでインデントします。
+
+    Returns
+    -------
+    bytes
+        JSON のバイト列です。
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(payload, option=option)
+    if indent:
+        return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _load_json(data: bytes) -> object:
+    """UTF-8 の JSON バイト列をパースします。orjson があれば使います。
+
+    Parameters
+    ----------
+    data: bytes
+        JSON のバイト列です。
+
+    Returns
+    -------
+    object
+        パース結果です。不正な JSON では ``json.JSONDecodeError`` を送出します。
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _write_json_atomically(path: Path, payload: dict, durable: bool = True, indent: bool = False) -> None:
+    """*payload* を一時ファイル経由で *path* に原子的に書き込みます。
+
+    *durable* が ``False`` なら ``fsync`` を省きます。クラッシュ時に失われても再計算できる
+    ファイル (キャッシュ、ストリームの結果レコード、統計) に使います。os.replace による
+    原子性は変わらないため、読み手が書きかけの内容を見ることはありません。
+    JSON は既定で詰めて出力します。人が編集するファイルだけ *indent* を ``True`` にします。
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp_path = path.with_suffix(".tmp")
     with open(tmp_path, "wb") as handle:
-        handle.write(
-            json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
-        )
-        handle.flush()
-        os.fsync(handle.fileno())
+        handle.write(_dump_json(payload, indent=indent))
+        if durable:
+            handle.flush()
+            os.fsync(handle.fileno())
     os.replace(tmp_path, path)
 
 
@@ -739,16 +1156,21 @@ def _read_json_file(path: Path) -> dict | None:
     if not path.exists():
         return None
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except (OSError, json.JSONDecodeError):
+        return _load_json(path.read_bytes())
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
         return None
 
 
-def _is_violation_state_file(path: Path) -> tuple[ViolationStatus, int, str] | None:
-    match = re.match(
-        r"^(?P<priority>\d{3})__(?P<status>[a-z_]+)__(?P<id>[0-9a-f]{64})\.state\.json$",
-        path.name,
-    )
+_VIOLATION_STATE_FILE_RE = re.compile(
+    r"^(?P<priority>\d{3})__(?P<status>[a-z_]+)__(?P<id>[0-9a-f]{64})\.state\.json$"
+)
+
+
+def _is_violation_state_file(name: str) -> tuple[ViolationStatus, int, str] | None:
+    # キュー ディレクトリの全ファイルに対して呼ばれるため、拡張子で先に振り落とします。
+    if not name.endswith(".state.json"):
+        return None
+    match = _VIOLATION_STATE_FILE_RE.match(name)
     if not match:
         return None
     try:
@@ -758,38 +1180,85 @@ def _is_violation_state_file(path: Path) -> tuple[ViolationStatus, int, str] | N
     return status, int(match.group("priority")), match.group("id")
 
 
+# 状態ファイルのパース結果を、パスごとに ``(inode, mtime_ns, size)`` のスタンプ付きで記憶します。
+# ストリーム ワーカーはユニットごとにキューを走査するため、変わっていないファイルを読み直さずに済みます。
+# 状態の書き込みは一時ファイルからの os.replace なので、書き換わると inode が変わります。
+_QUEUE_STATE_CACHE: dict[str, tuple[tuple[int, int, int], dict]] = {}
+_QUEUE_STATE_CACHE_LOCK = threading.Lock()
+
+
+def _read_queue_state(entry: os.DirEntry) -> dict | None:
+    """状態ファイルを読み込みます。スタンプが前回と同じならパース済みの内容のコピーを返します。"""
+    try:
+        stat = entry.stat()
+    except OSError:
+        return None
+    stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    with _QUEUE_STATE_CACHE_LOCK:
+        cached = _QUEUE_STATE_CACHE.get(entry.path)
+    if cached is not None and cached[0] == stamp:
+        return dict(cached[1])
+
+    data = _read_json_file(Path(entry.path))
+    with _QUEUE_STATE_CACHE_LOCK:
+        if isinstance(data, dict):
+            _QUEUE_STATE_CACHE[entry.path] = (stamp, data)
+        else:
+            _QUEUE_STATE_CACHE.pop(entry.path, None)
+    return dict(data) if isinstance(data, dict) else None
+
+
 def _list_queue_states(
     queue_dir: Path,
     stream_id: str | None = None,
     violation_id: str | None = None,
     statuses: set[ViolationStatus] | None = None,
+    ordered: bool = True,
 ) -> list[tuple[Path, dict, int, ViolationStatus]]:
-    if not queue_dir.exists():
+    try:
+        with os.scandir(queue_dir) as it:
+            # 名前で先に絞り込み、種別は getdents の結果だけで判定して stat を避けます。
+            entries = [
+                entry for entry in it
+                if entry.name.endswith(".state.json") and entry.is_file(follow_symlinks=False)
+            ]
+    except OSError:
         return []
 
     states: list[tuple[Path, dict, int, ViolationStatus]] = []
     status_filter = statuses if statuses is not None else None
+    seen_paths: set[str] = set()
 
-    for path in sorted(queue_dir.iterdir()):
-        if not path.is_file():
-            continue
-        parsed = _is_violation_state_file(path)
+    for entry in entries:
+        parsed = _is_violation_state_file(entry.name)
         if not parsed:
             continue
+        seen_paths.add(entry.path)
         file_status, priority, _id = parsed
         if violation_id is not None and _id != violation_id:
             continue
-        data = _read_json_file(path)
-        if not isinstance(data, dict):
+        # ファイル名から分かる条件は、内容を読む前に判定します。
+        if status_filter is not None and file_status not in status_filter:
+            continue
+        data = _read_queue_state(entry)
+        if data is None:
             continue
         if data.get("id") and _id != data.get("id"):
             continue
         if stream_id is not None and data.get("run_id") != stream_id:
             continue
-        if status_filter is not None and file_status not in status_filter:
-            continue
-        states.append((path, data, priority, file_status))
-
+        states.append((Path(entry.path), data, priority, file_status))
+
+    # 遷移 (リネーム) や削除で消えたファイルの記録を捨てます。
+    queue_prefix = os.path.join(str(queue_dir), "")
+    with _QUEUE_STATE_CACHE_LOCK:
+        stale = [key for key in _QUEUE_STATE_CACHE if key.startswith(queue_prefix) and key not in seen_paths]
+        for key in stale:
+            del _QUEUE_STATE_CACHE[key]
+
+    # 全件を走査するだけの呼び出し元は順序を使わないため、ソートを省きます。
+    if not ordered:
+        return states
     states.sort(
         key=lambda item: (
             item[2],
@@ -819,7 +1288,11 @@ def _collect_orphan_in_progress_for_file(
     now_ts: float,
 ) -> list[tuple[Path, dict, int]]:
     locked: list[tuple[Path, dict, int]] = []
-    for path, data, priority, status in _list_queue_states(queue_dir, statuses={ViolationStatus.IN_PROGRESS}):
+    for path, data, priority, status in _list_queue_states(
+        queue_dir,
+        statuses={ViolationStatus.IN_PROGRESS},
+        ordered=False,
+    ):
         if path == exclude_path:
             continue
         if data.get("target_file_path") != target_file_path:
@@ -835,6 +1308,7 @@ def _force_expired_to_pending(queue_dir: Path, now_ts: float) -> int:
     for path, data, priority, _status in _list_queue_states(
         queue_dir,
         statuses={ViolationStatus.IN_PROGRESS},
+        ordered=False,
     ):
         if not _is_lease_expired(data, now_ts):
             continue
@@ -874,6 +1348,7 @@ def _mark_non_current_runs_stale(queue_dir: Path, current_stream_id: str, now_ts
     stale_candidates = _list_queue_states(
         queue_dir,
         statuses={ViolationStatus.PENDING, ViolationStatus.IN_PROGRESS, ViolationStatus.MANUAL_REVIEW},
+        ordered=False,
     )
     for path, data, _priority, status in stale_candidates:
         if data.get("run_id") == current_stream_id:
@@ -949,6 +1424,7 @@ def _active_in_progress_for_violation(
         queue_dir,
         violation_id=violation_id,
         statuses={ViolationStatus.IN_PROGRESS},
+        ordered=False,
     ):
         if status != ViolationStatus.IN_PROGRESS:
             continue
@@ -1112,7 +1588,7 @@ def write_violations_result_append(
         results_dir
         / f"{violation_id}__{stream_id}__{int(time.time_ns())}.json"
     )
-    _write_json_atomically(record_path, payload)
+    _write_json_atomically(record_path, payload, durable=False)
 
 
 def write_result_file(
@@ -1153,15 +1629,23 @@ def write_result_file(
         "cache_hit": cache_hit,
     }
     out_dir = results_dir / "results"
-    out_dir.mkdir(parents=True, exist_ok=True)
-    (out_dir / result_filename).write_text(
-        json.dumps(result_data, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    result_path = out_dir / result_filename
+    # ポーリング側が書きかけの結果を読まないよう、一時ファイルに 1 回で書いてから置き換えます。
+    # ストリーム結果は使い捨てなので fsync はしません。
+    tmp_path = out_dir / f".{result_filename}.tmp"
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    try:
+        fd = os.open(tmp_path, flags, 0o644)
+    except FileNotFoundError:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(tmp_path, flags, 0o644)
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(_dump_json(result_data))
+    os.replace(tmp_path, result_path)
 
 
-def run_git(*args: str) -> str:
-    """git コマンドを実行し、前後の空白を除去した stdout を返します。
+def run_git_bytes(*args: str) -> bytes:
+    """git コマンドを実行し、前後の空白を除去した stdout をバイト列のまま返します。
 
     Parameters
     ----------
@@ -1170,53 +1654,174 @@ def run_git(*args: str) -> str:
 
     Returns
     -------
-    str
+    bytes
         標準出力の内容 (前後の空白を除去) です。
     """
     result = subprocess.run(
         ["git", *args],
         capture_output=True,
-        text=True,
+        check=False,
     )
     return result.stdout.strip()
 
 
-def get_diff(staged: bool) -> str:
-    """unified diff を取得します (staged または working)。
+def run_git(*args: str) -> str:
+    """git コマンドを実行し、前後の空白を除去した stdout を返します。
 
     Parameters
     ----------
-    staged: bool
-        ``True`` なら ``git diff --cached``、``False`` なら ``git diff`` を実行します。
+    *args: str
+        ``git`` に渡すサブコマンドとオプションです。
 
     Returns
     -------
     str
-        diff の出力です。差分がなければ空文字列です。
+        標準出力の内容 (前後の空白を除去) です。UTF-8 として解釈できないバイトは置換文字にします。
     """
-    if staged:
-        return run_git("diff", "--cached")
-    return run_git("diff")
+    # text=True だとロケールのデコーダーと改行変換を通るため、バイト列で受けて 1 回だけデコードします。
+    return run_git_bytes(*args).decode("utf-8", "replace")
+
+
+class GitCatFile:
+    """常駐させた ``git cat-file --batch`` プロセスから blob を読み出します。
+
+    ファイルごとに ``git show`` を起動する代わりに、1 プロセスの stdin/stdout で
+    オブジェクト名を送って内容を受け取ります。プロセスは初回の読み出し時に起動します。
+    """
+
+    def __init__(self) -> None:
+        self._process: subprocess.Popen | None = None
+        self._lock = threading.Lock()
+
+    def _ensure_process(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return self._process
+
+    def read_blob(self, object_name: str) -> bytes | None:
+        """*object_name* (``:<path>`` や blob ID) の内容を返します。
+
+        Parameters
+        ----------
+        object_name: str
+            ``git cat-file`` が解釈できるオブジェクト名です。改行を含んではいけません。
+
+        Returns
+        -------
+        bytes | None
+            オブジェクトの内容です。存在しない場合は ``None`` です。
+        """
+        return self.read_blobs([object_name])[0]
+
+    def read_blobs(self, object_names: list[str]) -> list[bytes | None]:
+        """複数のオブジェクトの内容を 1 往復で読み出します。
+
+        要求をまとめて書き込みながら応答を順に読むため、ファイル数が多くても
+        1 件ごとの書き込みと読み出しの待ち合わせが発生しません。要求の書き込みは
+        別スレッドで行い、stdin と stdout のパイプが互いに詰まらないようにします。
+
+        Parameters
+        ----------
+        object_names: list[str]
+            ``git cat-file`` が解釈できるオブジェクト名のリストです。改行を含む名前は ``None`` になります。
+
+        Returns
+        -------
+        list[bytes | None]
+            *object_names* と同じ順序の内容です。存在しない場合は ``None`` です。
+        """
+        results: list[bytes | None] = [None] * len(object_names)
+        requested = [i for i, name in enumerate(object_names) if "\n" not in name]
+        if not requested:
+            return results
+        request = b"".join(object_names[i].encode("utf-8") + b"\n" for i in requested)
+
+        with self._lock:
+            process = self._ensure_process()
+            assert process.stdin is not None and process.stdout is not None
+            stdin = process.stdin
+
+            def write_requests() -> None:
+                try:
+                    stdin.write(request)
+                    stdin.flush()
+                except (OSError, ValueError):
+                    pass
+
+            writer = threading.Thread(target=write_requests, daemon=True)
+            writer.start()
+            try:
+                for i in requested:
+                    header = process.stdout.readline().split()
+                    if not header:
+                        raise OSError("git cat-file closed its output.")
+                    # "<name> missing" / "<name> ambiguous" の応答です。名前に空白を含むと
+                    # トークン数が 3 になることもあるため、末尾の語で判定します。
+                    if header[-1] in (b"missing", b"ambiguous") or len(header) != 3:
+                        continue
+                    size = int(header[2])
+                    results[i] = process.stdout.read(size)
+                    process.stdout.read(1)  # 末尾の改行です。
+            except (OSError, ValueError):
+                # 書き込みスレッドがパイプで止まらないよう、先にプロセスを終了させます。
+                process.kill()
+                writer.join()
+                self._close_locked()
+                return results
+            writer.join()
+            return results
+
+    def _close_locked(self) -> None:
+        if self._process is None:
+            return
+        try:
+            if self._process.stdin:
+                self._process.stdin.close()
+            self._process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+        self._process = None
+
+    def close(self) -> None:
+        """常駐プロセスを終了します。"""
+        with self._lock:
+            self._close_locked()
+
+
+GIT_CAT_FILE = GitCatFile()
+atexit.register(GIT_CAT_FILE.close)
+
 
+def get_diff(staged: bool, pathspecs: list[str] | None = None) -> bytes:
+    """unified diff を取得します (staged または working)。
 
-def get_changed_files(staged: bool) -> list[str]:
-    """変更されたファイル パスのリストを取得します (削除されたファイルを除く)。
+    ファイルごとのチャンクに分けてから必要な分だけデコードするため、バイト列のまま返します。
+    変更ファイル一覧も出力から求めるため、色付けや外部 diff、パスの接頭辞といった
+    ユーザーの git 設定に左右されないオプションを明示します。
 
     Parameters
     ----------
     staged: bool
-        ``True`` なら staged な変更、``False`` なら working な変更を対象にします。
+        ``True`` なら ``git diff --cached``、``False`` なら ``git diff`` を実行します。
+    pathspecs: list[str] | None
+        指定すると、一致するパスの diff だけを出力させます (``None`` なら全ファイル)。
 
     Returns
     -------
-    list[str]
-        変更されたファイル パスのリストです。
+    bytes
+        diff の出力です。差分がなければ空のバイト列です。
     """
-    args = ["diff", "--name-only", "--diff-filter=d"]
+    args = ["diff", "--no-color", "--no-ext-diff", "--src-prefix=a/", "--dst-prefix=b/"]
     if staged:
-        args.insert(1, "--cached")
-    output = run_git(*args)
-    return output.splitlines() if output else []
+        args.append("--cached")
+    if pathspecs is not None:
+        args += ["--", *pathspecs]
+    return run_git_bytes(*args)
 
 
 def get_all_tracked_files() -> list[str]:
@@ -1231,6 +1836,22 @@ def get_all_tracked_files() -> list[str]:
     return output.splitlines() if output else []
 
 
+def _normalize_newlines(text: str) -> str:
+    """``read_text`` や text モードの ``git show`` と同じく、改行を ``"\\n"`` にそろえます。"""
+    if "\r" in text:
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _staged_blob_text(blob: bytes) -> str:
+    """index 上の blob を、作業ツリーの読み込みと同じ行番号になるテキストにします。
+
+    改行をそろえ、末尾の空白だけを除きます。先頭の空行は diff の hunk の行番号と
+    合わせるため残します。UTF-8 として解釈できなければ ``UnicodeDecodeError`` を送出します。
+    """
+    return _normalize_newlines(blob.decode("utf-8")).rstrip()
+
+
 def get_file_content(file_path: str, staged: bool) -> str:
     """ファイルの内容を取得します (staged 版またはワーキング コピー)。
 
@@ -1239,7 +1860,7 @@ def get_file_content(file_path: str, staged: bool) -> str:
     file_path: str
         ファイル パスです。
     staged: bool
-        ``True`` なら ``git show :<path>`` で staged 版を取得します。
+        ``True`` なら常駐の ``git cat-file --batch`` で index 上の staged 版を取得します。
 
     Returns
     -------
@@ -1247,13 +1868,19 @@ def get_file_content(file_path: str, staged: bool) -> str:
         ファイルの内容です。
     """
     if staged:
-        return run_git("show", f":{file_path}")
+        blob = GIT_CAT_FILE.read_blob(f":{file_path}")
+        if blob is None:
+            return ""
+        return _staged_blob_text(blob)
     return Path(file_path).read_text(encoding="utf-8")
 
 
 def parse_frontmatter(content: str) -> tuple[dict | None, str]:
     """ルール ファイルの内容から YAML フロント マターをパースします。
 
+    同じ内容のパース結果はプロセス内で再利用します (watch モードではサイクルごとに
+    ルールを読み直すためです)。返す辞書は呼び出しごとのコピーです。
+
     Parameters
     ----------
     content: str
@@ -1264,32 +1891,48 @@ def parse_frontmatter(content: str) -> tuple[dict | None, str]:
     tuple[dict | None, str]
         ``(frontmatter_dict, body)``。フロント マターがなければ ``(None, content)``。
     """
-    match = re.match(r"\A---\s*\n(.*?)\n---\s*\n", content, re.DOTALL)
-    if not match:
-        return None, content
+    frontmatter, body = _parse_frontmatter_cached(content)
+    return (dict(frontmatter) if frontmatter is not None else None), body
 
-    raw = match.group(1).strip()
-    body = content[match.end():]
 
-    def _parse_scalar(value: str):
-        trimmed = value.strip()
-        if trimmed == "":
-            return ""
+_FRONTMATTER_RE = re.compile(r"\A---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+# フロント マターの空行以外の各行を (インデント, 前後の空白を除いた本文) に分けます。
+_FRONTMATTER_LINE_RE = re.compile(r"^([ \t]*)[^\S\n]*(\S.*?)\s*$", re.MULTILINE)
+# json.loads に渡す価値のある値の先頭文字です。それ以外は JSON としてパースできません。
+_JSON_SCALAR_PREFIXES = tuple('[{"-0123456789')
+_JSON_SCALAR_WORDS = frozenset({"true", "false", "null", "NaN", "Infinity"})
+
+
+def _parse_frontmatter_scalar(value: str):
+    trimmed = value.strip()
+    if trimmed == "":
+        return ""
+    if trimmed.startswith(_JSON_SCALAR_PREFIXES) or trimmed in _JSON_SCALAR_WORDS:
         try:
             return json.loads(trimmed)
         except json.JSONDecodeError:
-            lowered = trimmed.lower()
-            if lowered in {"true", "false"}:
-                return lowered == "true"
-            return trimmed.strip("\"'")
+            pass
+    lowered = trimmed.lower()
+    if lowered in {"true", "false"}:
+        return lowered == "true"
+    return trimmed.strip("\"'")
 
-    lines = raw.splitlines()
+
+@functools.lru_cache(maxsize=1024)
+def _parse_frontmatter_cached(content: str) -> tuple[dict | None, str]:
+    match = _FRONTMATTER_RE.match(content)
+    if not match:
+        return None, content
+
+    raw = match.group(1).strip()
+    body = content[match.end():]
+
+    lines = _FRONTMATTER_LINE_RE.findall(raw)
     frontmatter = {}
     i = 0
     while i < len(lines):
-        line = lines[i]
-        stripped = line.strip()
-        if not stripped or ":" not in stripped:
+        _indent, stripped = lines[i]
+        if ":" not in stripped:
             i += 1
             continue
         key, value = stripped.split(":", 1)
@@ -1297,7 +1940,7 @@ def parse_frontmatter(content: str) -> tuple[dict | None, str]:
         value = value.strip()
 
         if value != "":
-            frontmatter[key] = _parse_scalar(value)
+            frontmatter[key] = _parse_frontmatter_scalar(value)
             i += 1
             continue
 
@@ -1305,25 +1948,76 @@ def parse_frontmatter(content: str) -> tuple[dict | None, str]:
         items = []
         j = i + 1
         while j < len(lines):
-            next_line = lines[j]
-            next_stripped = next_line.strip()
-            if not next_stripped:
-                j += 1
-                continue
-            if not next_line.startswith((" ", "\t")):
+            next_indent, next_stripped = lines[j]
+            if not next_indent or not next_stripped.startswith("-"):
                 break
-            if next_stripped.startswith("-"):
-                item_text = next_stripped[1:].strip()
-                items.append(_parse_scalar(item_text))
-                j += 1
-                continue
-            break
+            items.append(_parse_frontmatter_scalar(next_stripped[1:]))
+            j += 1
         frontmatter[key] = items if items else ""
         i = j
 
     return frontmatter, body
 
 
+def _iter_rule_entries(root: str):
+    """*root* 以下の ``.md`` ファイルの ``os.DirEntry`` を ``os.scandir`` で再帰的に列挙します。
+
+    ``rglob`` と同じく、シンボリック リンクのディレクトリには入らず、
+    シンボリック リンクのファイルは対象にします。
+    """
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from _iter_rule_entries(entry.path)
+        elif entry.name.endswith(".md") and entry.is_file():
+            yield entry
+
+
+def _iter_rule_files(root: str):
+    """*root* 以下の ``.md`` ファイルのパスを再帰的に列挙します。"""
+    for entry in _iter_rule_entries(root):
+        yield entry.path
+
+
+_RULE_CODE_SPAN_RE = re.compile(r"`([^`\n]+)`")
+_RULE_KEYWORD_TOKEN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]{3,}")
+
+
+def resolve_rule_keywords(value, rule_body: str) -> tuple[str, ...]:
+    """フロント マターの ``keywords`` から、事前フィルター用のキーワードを決めます。
+
+    ``keywords: auto`` ならルール本文のインライン コード (`` `...` ``) に含まれる
+    4 文字以上の識別子を使います。リストまたは文字列ならその値をそのまま使います。
+
+    Parameters
+    ----------
+    value: object
+        フロント マターの ``keywords`` の値です。未指定なら ``None`` です。
+    rule_body: str
+        ルール本文です。
+
+    Returns
+    -------
+    tuple[str, ...]
+        キーワードのタプルです。空ならフィルターしません。
+    """
+    if value == "auto":
+        tokens = {
+            token
+            for span in _RULE_CODE_SPAN_RE.findall(rule_body)
+            for token in _RULE_KEYWORD_TOKEN_RE.findall(span)
+        }
+        return tuple(sorted(tokens))
+    if isinstance(value, list):
+        return tuple(str(item) for item in value if str(item))
+    if isinstance(value, str) and value:
+        return (value,)
+    return ()
+
+
 def load_rules_from_dir(rules_dir: Path) -> tuple[RuleList, list[str]]:
     """単一ディレクトリからルール ファイルとその対象パターンを読み込みます。
 
@@ -1343,13 +2037,30 @@ def load_rules_from_dir(rules_dir: Path) -> tuple[RuleList, list[str]]:
 
     rules = []
     warnings = []
-    for md_file in sorted(rules_dir.rglob("*.md")):
-        file_content = md_file.read_text(encoding="utf-8")
+    root = str(rules_dir)
+    # ディレクトリ相対パスをルール名として使用します (例: readable_code/02_naming.md)。
+    # 並び順は従来の sorted(rglob) と同じくパス要素ごとの比較です。
+    relative_names = sorted(
+        (os.path.relpath(md_path, root) for md_path in _iter_rule_files(root)),
+        key=lambda name: name.split(os.sep),
+    )
+
+    def read_rule_file(relative_name: str) -> str:
+        with open(os.path.join(root, relative_name), "rb") as handle:
+            # read_text と同じく改行を "\n" にそろえます。
+            return _normalize_newlines(handle.read().decode("utf-8"))
+
+    # ルール ファイルの読み込みは I/O 待ちが主なので、スレッドで並列に発行します (順序は保たれます)。
+    workers = max(1, min(FILE_READ_MAX_WORKERS, len(relative_names)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        file_contents = list(executor.map(read_rule_file, relative_names))
+
+    for relative_name, file_content in zip(relative_names, file_contents):
         frontmatter, body = parse_frontmatter(file_content)
 
         if frontmatter is None or "applies_to" not in frontmatter:
             warnings.append(
-                f"ルール ファイル {md_file.name} に `applies_to` フロント マターがありません。追記してください。"
+                f"ルール ファイル {os.path.basename(relative_name)} に `applies_to` フロント マターがありません。追記してください。"
             )
             continue
 
@@ -1361,10 +2072,9 @@ def load_rules_from_dir(rules_dir: Path) -> tuple[RuleList, list[str]]:
             "cross_file": bool(frontmatter.get("cross_file", False)),
             "dependency_scope": str(frontmatter.get("dependency_scope", "")).strip().lower(),
             "severity": str(frontmatter.get("severity", "")).strip().lower(),
+            "keywords": resolve_rule_keywords(frontmatter.get("keywords"), body),
         }
 
-        # ディレクトリ相対パスをルール名として使用します (例: readable_code/02_naming.md)。
-        relative_name = str(md_file.relative_to(rules_dir))
         rules.append((relative_name, patterns, body, rule_options))
 
     return rules, warnings
@@ -1379,12 +2089,14 @@ def find_project_rules_dirs() -> list[Path]:
         見つかった全ディレクトリを近い順 (CWD 側が先) に返します。
     """
     dirs = []
-    current = Path.cwd().resolve()
+    # os.getcwd() はシンボリック リンクを解決済みの絶対パスを返すため、resolve() は不要です。
+    # 階層ごとに Path を組み立てず、文字列のまま stat 1 回で判定します。
+    current = os.getcwd()
     while True:
-        candidate = current / ".complete-validator" / "rules"
-        if candidate.is_dir():
-            dirs.append(candidate)
-        parent = current.parent
+        candidate = os.path.join(current, ".complete-validator", "rules")
+        if os.path.isdir(candidate):
+            dirs.append(Path(candidate))
+        parent = os.path.dirname(current)
         if parent == current:
             break
         current = parent
@@ -1424,6 +2136,149 @@ def merge_rules(
     return list(merged.values()), all_warnings
 
 
+def _rule_sources_signature(builtin_dir: Path | None, project_dirs: list[Path]) -> tuple[str, bool]:
+    """ルール ディレクトリ群の ``.md`` ファイルの ``(path, mtime_ns, size)`` からシグネチャを作ります。
+
+    ファイルの追加、削除、更新のいずれでもシグネチャが変わります。ファイル内容は読みません。
+    更新直後のファイルは同じスタンプのまま内容が変わりうるため、そのようなファイルがあるかも返します
+    (``FileDigestCache`` と同じ racy-clean 対策です)。
+
+    Returns
+    -------
+    tuple[str, bool]
+        ``(signature, racy)`` です。racy は更新から ``FILE_DIGEST_RACY_WINDOW_NS`` 以内のファイルがあれば ``True`` です。
+    """
+    digest = hashlib.sha256(RULES_CACHE_VERSION.encode("utf-8"))
+    racy_since = time.time_ns() - FILE_DIGEST_RACY_WINDOW_NS
+    racy = False
+    sources: list[Path] = list(project_dirs)
+    if builtin_dir is not None:
+        sources.append(builtin_dir)
+    for rules_dir in sources:
+        root = str(rules_dir)
+        digest.update(f"\0dir\0{root}".encode("utf-8"))
+        # DirEntry.stat() は結果をエントリに保持し、Windows では列挙時の情報をそのまま使います。
+        for entry in sorted(_iter_rule_entries(root), key=lambda entry: entry.path):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            digest.update(f"\0{entry.path}\0{stat.st_mtime_ns}\0{stat.st_size}".encode("utf-8"))
+            racy = racy or stat.st_mtime_ns >= racy_since
+    return digest.hexdigest(), racy
+
+
+def load_rules_cached(
+    builtin_dir: Path | None,
+    project_dirs: list[Path],
+    base_dir: Path,
+) -> tuple[RuleList, list[str]]:
+    """``merge_rules`` の結果を ``.complete-validator/rules-cache.json`` に保存して再利用します。
+
+    ルール ファイルのスタンプが前回と同じなら、ルール ファイルの読み込みとパースを省略します。
+    更新直後のルール ファイルがある間はスタンプを信用できないため、キャッシュを読みも書きもしません。
+
+    Parameters
+    ----------
+    builtin_dir: Path | None
+        プラグイン組み込み ``rules/`` ディレクトリです。
+    project_dirs: list[Path]
+        プロジェクト側の ``rules/`` ディレクトリ (近い順) です。
+    base_dir: Path
+        ``.complete-validator/`` を置くディレクトリです (通常は git toplevel)。
+
+    Returns
+    -------
+    tuple[RuleList, list[str]]
+        ``merge_rules`` と同じ ``(merged_rules, warnings)`` です。
+    """
+    cache_path = base_dir / ".complete-validator" / "rules-cache.json"
+    signature, racy = _rule_sources_signature(builtin_dir, project_dirs)
+    if racy:
+        return merge_rules(builtin_dir, project_dirs)
+    cached = _read_json_file(cache_path)
+    if isinstance(cached, dict) and cached.get("signature") == signature:
+        try:
+            rules = [
+                (name, list(patterns), body, {**options, "keywords": tuple(options.get("keywords", ()))})
+                for name, patterns, body, options in cached["rules"]
+            ]
+            return rules, list(cached["warnings"])
+        except (KeyError, TypeError, ValueError):
+            pass
+
+    rules, warnings = merge_rules(builtin_dir, project_dirs)
+    try:
+        _write_json_atomically(
+            cache_path, {"signature": signature, "rules": rules, "warnings": warnings}, durable=False,
+        )
+    except OSError:
+        pass
+    return rules, warnings
+
+
+_GLOB_META_CHARS = frozenset("*?[")
+# fnmatch.fnmatch と同じく os.path.normcase で照合します。Windows では大文字小文字を区別しません。
+_NORMCASE_FOLDS_CASE = os.path.normcase("A") != "A"
+
+
+def _basename(file_path: str) -> str:
+    """git 出力のパス (区切りは常に ``/``) から basename を取り出します。
+
+    照合のホット パスで呼ばれるため、``os.path.basename`` ではなく ``str.rpartition`` を使います。
+    """
+    return file_path.rpartition("/")[2]
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_patterns(patterns: tuple[str, ...]):
+    """glob パターン群を、basename を受け取って一致を返す関数にまとめます。
+
+    ``*.py`` や ``*_test.py`` のような「``*`` + 固定文字列」は ``str.endswith``、
+    ``Makefile`` のような固定文字列は集合で判定し、それ以外のパターンだけを
+    1 つの正規表現にまとめて照合します。パターンと basename は ``fnmatch.fnmatch`` と同じく
+    ``os.path.normcase`` を通すため、Windows では大文字小文字を区別しません。
+
+    Parameters
+    ----------
+    patterns: tuple[str, ...]
+        glob パターンのタプルです。
+
+    Returns
+    -------
+    Callable[[str], bool]
+        いずれかのパターンに一致する basename で ``True`` を返す関数です。空なら常に ``False`` です。
+    """
+    suffixes: list[str] = []
+    names: set[str] = set()
+    other_patterns: list[str] = []
+    for pat in map(os.path.normcase, patterns):
+        if pat.startswith("*") and not _GLOB_META_CHARS.intersection(pat[1:]):
+            suffixes.append(pat[1:])
+        elif not _GLOB_META_CHARS.intersection(pat):
+            names.add(pat)
+        else:
+            other_patterns.append(pat)
+
+    suffix_tuple = tuple(suffixes)
+    regex_match = (
+        re.compile("|".join(fnmatch.translate(pat) for pat in other_patterns)).match
+        if other_patterns
+        else None
+    )
+
+    def match(basename: str) -> bool:
+        if _NORMCASE_FOLDS_CASE:
+            basename = os.path.normcase(basename)
+        if suffix_tuple and basename.endswith(suffix_tuple):
+            return True
+        if basename in names:
+            return True
+        return regex_match is not None and regex_match(basename) is not None
+
+    return match
+
+
 def files_matching_patterns(
     patterns: list[str],
     file_paths: list[str],
@@ -1442,12 +2297,8 @@ def files_matching_patterns(
     list[str]
         パターンに一致したファイル パスのリストです。
     """
-    matched = []
-    for file_path in file_paths:
-        filename = os.path.basename(file_path)
-        if any(fnmatch(filename, pat) for pat in patterns):
-            matched.append(file_path)
-    return matched
+    matcher = _compile_patterns(tuple(patterns))
+    return [file_path for file_path in file_paths if matcher(_basename(file_path))]
 
 
 def any_file_matches_rules(rules: RuleList, file_paths: list[str]) -> bool:
@@ -1465,12 +2316,54 @@ def any_file_matches_rules(rules: RuleList, file_paths: list[str]) -> bool:
     bool
         1 つ以上のファイルがいずれかのルールに一致すれば ``True`` です。
     """
-    for file_path in file_paths:
-        filename = os.path.basename(file_path)
-        for _rule_name, patterns, _body, _rule_options in rules:
-            if any(fnmatch(filename, pat) for pat in patterns):
-                return True
-    return False
+    all_patterns = tuple(pat for _name, patterns, _body, _rule_options in rules for pat in patterns)
+    matcher = _compile_patterns(all_patterns)
+    return any(matcher(_basename(file_path)) for file_path in file_paths)
+
+
+def select_rule_target_files(
+    rules: RuleList,
+    target_files: list[str],
+    cross_file_targets: set[str] | None = None,
+    matched_files: list[str] | None = None,
+) -> list[str]:
+    """いずれかのルールの applies_to に一致し、内容を読み込む必要があるファイルを返します。
+
+    全ルールのパターンを 1 つの正規表現にまとめ、basename ごとに 1 回だけ照合します。
+
+    Parameters
+    ----------
+    rules: RuleList
+        ルールのリストです。
+    target_files: list[str]
+        変更ファイル (またはフル スキャン対象) のリストです。
+    cross_file_targets: set[str] | None
+        依存関係から展開した追加ファイルです。``cross_file`` が有効なルールのパターンにだけ照合します。
+    matched_files: list[str] | None
+        *target_files* に対する照合結果 (この関数を *cross_file_targets* なしで呼んだ戻り値) です。
+        渡すと *target_files* を照合し直しません。
+
+    Returns
+    -------
+    list[str]
+        *target_files* のうち一致したもの (元の順序) に、一致した追加ファイル (ソート順) を続けたリストです。
+    """
+    if matched_files is not None:
+        matched = list(matched_files)
+    else:
+        all_patterns = tuple(pat for _name, patterns, _body, _rule_options in rules for pat in patterns)
+        matched = files_matching_patterns(list(all_patterns), target_files)
+    if cross_file_targets:
+        cross_file_patterns = [
+            pat
+            for _name, patterns, _body, rule_options in rules
+            if bool(rule_options.get("cross_file", False))
+            for pat in patterns
+        ]
+        seen = set(matched)
+        extra = [fp for fp in sorted(cross_file_targets) if fp not in seen]
+        matched.extend(files_matching_patterns(cross_file_patterns, extra))
+    return matched
 
 
 def _module_name_from_path(path: str) -> str:
@@ -1592,14 +2485,17 @@ def resolve_cross_file_targets(
     if not python_files:
         return set(target_files)
 
+    # staged 版は常駐の cat-file でまとめて読み出します (ファイルごとに git show を起動しません)。
+    # デコードは load_file_contents と同じく厳密に行い、UTF-8 でないファイルは依存解析から外します。
+    staged_blobs = GIT_CAT_FILE.read_blobs([f":{path}" for path in python_files]) if staged else []
     contents: dict[str, str] = {}
-    for path in python_files:
+    for index, path in enumerate(python_files):
         try:
-            if staged:
-                text = run_git("show", f":{path}")
-                if not text:
-                    text = Path(path).read_text(encoding="utf-8")
-            else:
+            text = (
+                _staged_blob_text(staged_blobs[index])
+                if staged and staged_blobs[index] else ""
+            )
+            if not text:
                 text = Path(path).read_text(encoding="utf-8")
         except (OSError, UnicodeDecodeError):
             continue
@@ -1623,21 +2519,101 @@ def resolve_cross_file_targets(
     return expanded
 
 
+def rule_diff_pathspecs(rules: RuleList) -> list[str] | None:
+    """ルールのパターンに一致しうるパスだけに ``git diff`` を絞る pathspec を返します。
+
+    basename に対する glob は ``:(top,glob)**/<pattern>`` で、リポジトリ内の全階層に一致させます。
+    Python の cross_file ルールがあれば、依存元の解決に使う ``*.py`` も含めます。
+    git の wildmatch と ``fnmatch`` で解釈が異なりうるパターン (``[``、``\\``、``/`` を含むもの) が
+    あれば絞り込まず ``None`` を返します。
+
+    Parameters
+    ----------
+    rules: RuleList
+        ルールのリストです。
+
+    Returns
+    -------
+    list[str] | None
+        pathspec のリストです。絞り込めない場合やルールがない場合は ``None`` です。
+    """
+    patterns = {pat for _name, rule_patterns, _body, _rule_options in rules for pat in rule_patterns}
+    if not patterns or any(char in pat for pat in patterns for char in "[\\/"):
+        return None
+    if any(
+        bool(options.get("cross_file"))
+        and str(options.get("dependency_scope", "")).strip().lower() in ("", "python_imports", "python_imports_direct")
+        for _name, _patterns, _body, options in rules
+    ):
+        patterns.add("*.py")
+    # applies_to の照合が大文字小文字を区別しない環境では、git 側の絞り込みもそろえます。
+    magic = "top,glob,icase" if _NORMCASE_FOLDS_CASE else "top,glob"
+    return [f":({magic})**/{pat}" for pat in sorted(patterns)]
+
+
+def _uses_cross_file_pool(rule_options: dict, cross_file_targets: set[str] | None) -> bool:
+    if not cross_file_targets:
+        return False
+    if not bool(rule_options.get("cross_file", False)):
+        return False
+    scope = str(rule_options.get("dependency_scope", "")).strip().lower()
+    return scope in ("", "python_imports", "python_imports_direct")
+
+
 def _rule_target_pool(
     rule_options: dict,
     target_files: list[str],
     cross_file_targets: set[str] | None,
 ) -> list[str]:
-    if not cross_file_targets:
-        return target_files
-    if not bool(rule_options.get("cross_file", False)):
-        return target_files
-    scope = str(rule_options.get("dependency_scope", "")).strip().lower()
-    if scope not in ("", "python_imports", "python_imports_direct"):
+    if not _uses_cross_file_pool(rule_options, cross_file_targets):
         return target_files
     return sorted(cross_file_targets)
 
 
+def enumerate_rule_units(
+    rules: RuleList,
+    target_files: list[str],
+    files: dict[str, str],
+    cross_file_targets: set[str] | None = None,
+) -> list[tuple[str, str, str]]:
+    """ルールごとの対象ファイルを求め、``(rule_name, rule_body, file_path)`` のチェック単位を列挙します。
+
+    対象ファイルの集合 (通常 / cross_file) と ``applies_to`` パターンの組ごとに
+    マッチ結果を 1 回だけ計算し、同じパターンのルール間で使い回します。
+
+    Parameters
+    ----------
+    rules: RuleList
+        チェックするルールのリストです。
+    target_files: list[str]
+        チェック対象のファイル パスのリストです。
+    files: dict[str, str]
+        ファイル パスをキー、内容を値とする辞書です。内容を読み込めたファイルだけが対象です。
+    cross_file_targets: set[str] | None
+        cross_file ルール向けに拡張した対象ファイルの集合です。
+
+    Returns
+    -------
+    list[tuple[str, str, str]]
+        チェック単位のリストです。ルール順、ルール内はファイル順です。
+    """
+    pools = {
+        False: [(fp, _basename(fp)) for fp in target_files if fp in files],
+        True: [(fp, _basename(fp)) for fp in sorted(cross_file_targets or ()) if fp in files],
+    }
+    matched_by_key: dict[tuple[bool, tuple[str, ...]], list[str]] = {}
+    units: list[tuple[str, str, str]] = []
+    for rule_name, rule_patterns, rule_body, rule_options in rules:
+        key = (_uses_cross_file_pool(rule_options, cross_file_targets), tuple(rule_patterns))
+        matched = matched_by_key.get(key)
+        if matched is None:
+            matcher = _compile_patterns(key[1])
+            matched = [fp for fp, basename in pools[key[0]] if matcher(basename)]
+            matched_by_key[key] = matched
+        units.extend((rule_name, rule_body, fp) for fp in matched)
+    return units
+
+
 def load_suppressions(base_dir: Path) -> str:
     """.complete-validator/suppressions.md から suppressions を読み込みます。
 
@@ -1652,14 +2628,108 @@ def load_suppressions(base_dir: Path) -> str:
         ファイルの内容を返します。ファイルが存在しない場合は空文字列を返します。
     """
     suppressions_path = base_dir / ".complete-validator" / "suppressions.md"
-    if not suppressions_path.exists():
+    try:
+        stat = os.stat(suppressions_path)
+    except OSError:
         return ""
     try:
-        return suppressions_path.read_text(encoding="utf-8").strip()
+        return _read_suppressions(str(suppressions_path), stat.st_mtime_ns, stat.st_size)
     except OSError:
         return ""
 
 
+@functools.lru_cache(maxsize=8)
+def _read_suppressions(path: str, mtime_ns: int, size: int) -> str:
+    """``(path, mtime_ns, size)`` のスタンプごとに suppressions の内容を記憶します。"""
+    return Path(path).read_text(encoding="utf-8").strip()
+
+
+# suppressions.md のルール専用セクションの見出しです (例: ``## rule: python_style.md``)。
+_SUPPRESSION_RULE_HEADING_RE = re.compile(r"^##[ \t]+rule:[ \t]*(.+?)[ \t]*$")
+
+
+@functools.lru_cache(maxsize=1024)
+def suppressions_for_rule(suppressions: str, rule_name: str) -> str:
+    """suppressions のうち *rule_name* に関係する部分だけを返します。
+
+    ``## rule: <ルール名>`` 見出しのセクション (次の ``#`` / ``##`` 見出しまで) はそのルールにだけ適用し、
+    それ以外の部分は全ルールに適用します。ルール専用セクションを編集しても他のルールの
+    プロンプトとキャッシュ キーは変わらないため、キャッシュが無効になるのは該当ルールだけです。
+    ルール専用セクションがなければ *suppressions* をそのまま返します。
+
+    Parameters
+    ----------
+    suppressions: str
+        suppressions.md の内容です。
+    rule_name: str
+        ルール名 (ルール ディレクトリからの相対パス) です。
+
+    Returns
+    -------
+    str
+        *rule_name* に適用する suppressions です。
+    """
+    if "rule:" not in suppressions:
+        return suppressions
+    kept: list[str] = []
+    section_rule: str | None = None
+    for line in suppressions.split("\n"):
+        heading = _SUPPRESSION_RULE_HEADING_RE.match(line)
+        if heading is not None:
+            section_rule = heading.group(1)
+        elif line.startswith("# ") or line.startswith("## "):
+            section_rule = None
+        if section_rule is None or section_rule == rule_name:
+            kept.append(line)
+    return "\n".join(kept).strip()
+
+
+@functools.lru_cache(maxsize=4096)
+def _hash_text(text: str) -> str:
+    """キャッシュ キーの構成要素となる文字列の SHA256 を計算します。
+
+    同じルール本文、ファイル内容、suppressions は複数のキャッシュ キーで共有されるため、
+    文字列ごとに 1 回だけハッシュします。
+
+    Parameters
+    ----------
+    text: str
+        ハッシュ対象の文字列です。
+
+    Returns
+    -------
+    str
+        SHA256 ハッシュ文字列です。
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# diff ヘッダーの ``index <旧 blob>..<新 blob>`` 行です。hunk 内の行は空白、``+``、``-``、``\`` で
+# 始まるため、行頭の ``index `` はヘッダーにしか現れません。
+_DIFF_INDEX_LINE_RE = re.compile(r"^index [0-9a-f]+\.\.[0-9a-f]+(?: [0-7]+)?\n", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_diff_for_cache(diff: str) -> str:
+    """キャッシュ キー用に diff から ``index`` 行を取り除きます。
+
+    ``index`` 行の blob ID は変更箇所と無関係な部分 (ベース側のファイル全体) にも依存するため、
+    ブランチの切り替えや rebase で hunk が同じでも値が変わり、キャッシュ ミスになります。
+    同じファイルの diff はルールの数だけ渡されるため、結果はプロセス内で再利用します。
+
+    Parameters
+    ----------
+    diff: str
+        ``git diff`` の出力 (1 ファイル分または複数ファイル分) です。
+
+    Returns
+    -------
+    str
+        ``index`` 行を除いた diff です。
+    """
+    return _DIFF_INDEX_LINE_RE.sub("", diff)
+
+
 def compute_cache_key(
     rule_name: str,
     rule_body: str,
@@ -1668,9 +2738,13 @@ def compute_cache_key(
     mode: str = "diff",
     per_file: bool = False,
     file_path: str = "",
+    content_digest: str = "",
 ) -> str:
     """キャッシュ用の SHA256 ハッシュを計算します。
 
+    ルール本文、diff (またはファイル内容)、suppressions はそれぞれ個別にハッシュし、
+    そのダイジェストを連結した文字列をハッシュします。
+
     Parameters
     ----------
     rule_name: str
@@ -1687,6 +2761,9 @@ def compute_cache_key(
         ``True`` なら per-file 粒度のキャッシュです。ストリーム モード用です。
     file_path: str
         per_file が ``True`` の場合のファイル パスです。
+    content_digest: str
+        *diff_for_rule* の内容を識別するダイジェスト (blob ID など) です。
+        指定時は *diff_for_rule* をハッシュせずにこの値を使います。
 
     Returns
     -------
@@ -1694,19 +2771,170 @@ def compute_cache_key(
         SHA256 ハッシュ文字列です。
     """
     granularity = "per-file" if per_file else "per-rule"
-    cache_key_material = (
-        PROMPT_VERSION + ":" + mode + ":" + granularity
-        + "\n---RULE_NAME---\n" + rule_name
-        + "\n---FILE_PATH---\n" + file_path
-        + "\n---RULE_BODY---\n" + rule_body
-        + "\n---DIFF---\n" + diff_for_rule
-        + "\n---SUPPRESSIONS---\n" + suppressions
-    )
+    cache_key_material = "\n".join((
+        PROMPT_VERSION,
+        mode,
+        granularity,
+        rule_name,
+        file_path,
+        _hash_text(rule_body),
+        ("blob:" + content_digest) if content_digest else _hash_text(diff_for_rule),
+        _hash_text(suppressions),
+    ))
     return hashlib.sha256(cache_key_material.encode("utf-8")).hexdigest()
 
 
+class ClaudePool:
+    """事前起動した ``claude -p`` プロセスを貸し出すプールです。
+
+    ``claude -p`` は起動と認証に時間がかかるため、チェック完了時に次のプロセスを
+    先行起動しておき、次のプロンプトでは起動済みのプロセスへ stdin を渡すだけにします。
+    1 プロセスは 1 プロンプトだけを処理します。セッションを使い回すと前のチェックの
+    会話コンテキストが次のチェックに混入するためです。
+    生存プロセス数 (実行中 + 待機中) は ``size`` 以下に保ちます。
+
+    Parameters
+    ----------
+    size: int
+        同時に生存させる ``claude -p`` プロセス数の上限です。
+    """
+
+    def __init__(self, size: int = DEFAULT_MAX_WORKERS) -> None:
+        self.size = max(1, size)
+        self._idle: dict[str, list[subprocess.Popen]] = defaultdict(list)
+        self._active = 0
+        self._closed = False
+        self._queued = 0
+        self._lock = threading.Lock()
+        self._env: dict[str, str] | None = None
+
+    def _spawn(self, model: str) -> subprocess.Popen:
+        # 環境変数はプロセスごとに同じなので、最初の起動時に 1 回だけ組み立てて使い回します。
+        env = self._env
+        if env is None:
+            env = self._env = {key: value for key, value in os.environ.items() if key != "CLAUDECODE"}
+        return subprocess.Popen(
+            ["claude", "-p", "--model", model],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+        )
+
+    def _idle_count_locked(self) -> int:
+        return sum(len(procs) for procs in self._idle.values())
+
+    def _checkout(self, model: str) -> subprocess.Popen:
+        """待機中のプロセスを取り出します。なければ新しく起動します。"""
+        with self._lock:
+            self._active += 1
+            while self._idle[model]:
+                proc = self._idle[model].pop()
+                if proc.poll() is None:
+                    return proc
+        try:
+            return self._spawn(model)
+        except Exception:
+            with self._lock:
+                self._active -= 1
+            raise
+
+    def _release(self, model: str) -> None:
+        """実行中のプロセス数を戻し、後続の単位と枠が残っていれば次のプロセスを先行起動します。"""
+        with self._lock:
+            self._active -= 1
+            idle_count = self._idle_count_locked()
+            if self._closed or self._queued <= idle_count or self._active + idle_count >= self.size:
+                return
+        try:
+            proc = self._spawn(model)
+        except OSError:
+            return
+        with self._lock:
+            if self._closed:
+                proc.kill()
+                return
+            self._idle[model].append(proc)
+
+    def set_queued(self, count: int) -> None:
+        """まだワーカーに渡していないチェック単位の数を設定します。
+
+        先行起動は、この数が待機中のプロセス数を上回るときだけ行います。最後の単位を
+        渡したあとに起動したプロセスは使われないまま終了時に kill されるためです。
+
+        Parameters
+        ----------
+        count: int
+            未着手の単位の数です。
+        """
+        with self._lock:
+            self._queued = max(0, count)
+
+    def resize(self, size: int) -> None:
+        """生存プロセス数の上限を変更します。
+
+        Parameters
+        ----------
+        size: int
+            新しい上限です。
+        """
+        with self._lock:
+            self.size = max(1, size)
+
+    def submit(self, prompt: str, model: str, timeout: float = CLAUDE_TIMEOUT_SECONDS) -> str:
+        """プロンプトを 1 つ処理し、応答を返します。
+
+        Parameters
+        ----------
+        prompt: str
+            Claude に送信するプロンプトです。
+        model: str
+            使用するモデル名です。
+        timeout: float
+            応答待ちの上限 (秒) です。超過時はプロセスを kill して ``TimeoutExpired`` を送出します。
+
+        Returns
+        -------
+        str
+            Claude の応答テキストです。
+        """
+        # プロンプトは 1 回だけ UTF-8 にエンコードし、パイプにはバイト列のまま渡します。
+        prompt_bytes = prompt.encode("utf-8")
+        proc = self._checkout(model)
+        try:
+            try:
+                stdout, stderr = proc.communicate(prompt_bytes, timeout=timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                raise
+        finally:
+            self._release(model)
+        if proc.returncode != 0:
+            error_text = stderr.decode("utf-8", "replace").strip()
+            return f"[Validator error] claude exited with code {proc.returncode}: {error_text}"
+        return stdout.decode("utf-8", "replace").strip()
+
+    def close(self) -> None:
+        """待機中のプロセスをすべて終了し、以降の先行起動を止めます。"""
+        with self._lock:
+            self._closed = True
+            procs = [proc for model_procs in self._idle.values() for proc in model_procs]
+            self._idle.clear()
+        for proc in procs:
+            proc.kill()
+            proc.communicate()
+
+
+# プロセス全体で共有する claude -p プールです。上限は main 側で max_workers に合わせます。
+CLAUDE_POOL = ClaudePool()
+atexit.register(CLAUDE_POOL.close)
+
+
 def run_claude_check(prompt: str, model: str = DEFAULT_MODEL) -> str:
-    """指定されたプロンプトで ``claude -p`` を実行し、応答を返します。
+    """指定されたプロンプトを ``claude -p`` で実行し、応答を返します。
+
+    プロセスは ``CLAUDE_POOL`` から取り出します。
 
     Parameters
     ----------
@@ -1720,79 +2948,306 @@ def run_claude_check(prompt: str, model: str = DEFAULT_MODEL) -> str:
     str
         Claude の応答テキストです。
     """
-    env = os.environ.copy()
-    env.pop("CLAUDECODE", None)
-    cmd = ["claude", "-p", "--model", model]
-    result = subprocess.run(
-        cmd,
-        input=prompt,
-        capture_output=True,
-        text=True,
-        timeout=CLAUDE_TIMEOUT_SECONDS,
-        env=env,
-    )
-    if result.returncode != 0:
-        return f"[Validator error] claude exited with code {result.returncode}: {result.stderr.strip()}"
-    return result.stdout.strip()
+    return CLAUDE_POOL.submit(prompt, model)
+
+
+_C_QUOTE_ESCAPES = {
+    ord("a"): 0x07, ord("b"): 0x08, ord("t"): 0x09, ord("n"): 0x0A,
+    ord("v"): 0x0B, ord("f"): 0x0C, ord("r"): 0x0D, ord('"'): 0x22, ord("\\"): 0x5C,
+}
+
+
+def _unquote_git_path(token: bytes) -> tuple[bytes, bytes]:
+    """diff ヘッダー中のパス 1 つを取り出し、git の C 形式クォートを外します。
+
+    Parameters
+    ----------
+    token: bytes
+        パスで始まるバイト列です。``"`` で始まればクォートされたパスとして扱います。
+
+    Returns
+    -------
+    tuple[bytes, bytes]
+        ``(path, rest)`` です。クォートされていなければ *token* 全体をパスとし、rest は空です。
+    """
+    if not token.startswith(b'"'):
+        return token, b""
+    path = bytearray()
+    index = 1
+    while index < len(token):
+        byte = token[index]
+        if byte == 0x22:  # 閉じクォートです。
+            return bytes(path), token[index + 1:].lstrip(b" ")
+        if byte == 0x5C and index + 1 < len(token):
+            escaped = token[index + 1]
+            if 0x30 <= escaped <= 0x37:
+                path.append(int(token[index + 1:index + 4], 8))
+                index += 4
+                continue
+            path.append(_C_QUOTE_ESCAPES.get(escaped, escaped))
+            index += 2
+            continue
+        path.append(byte)
+        index += 1
+    return bytes(path), b""
 
 
-def split_diff_by_file(diff: str) -> dict[str, str]:
+def _diff_section_path(section: bytes) -> bytes | None:
+    """``diff --git`` セクション 1 つから変更後 (削除なら変更前) のパスを求めます。
+
+    ``a/X b/Y`` のヘッダーは X や Y が `` b/`` を含むと区切れないため、先に
+    ``+++``/``---``/``rename to``/``copy to`` の行を見ます。それらがないセクション
+    (バイナリやモードだけの変更) は変更前後が同じパスなので、ヘッダーを半分に割って求めます。
+
+    Parameters
+    ----------
+    section: bytes
+        先頭の ``diff --git `` を除いたセクションです。
+
+    Returns
+    -------
+    bytes | None
+        パスです。求められなければ ``None`` です。
+    """
+    header_line, _sep, rest = section.partition(b"\n")
+    # 拡張ヘッダーは最初の hunk より前にしかないため、hunk 本体は分割しません。
+    hunk_start = rest.find(b"\n@@")
+    source = None
+    for line in (rest if hunk_start < 0 else rest[:hunk_start]).split(b"\n"):
+        if line.startswith((b"rename to ", b"copy to ")):
+            return _unquote_git_path(line.partition(b" to ")[2])[0]
+        if line.startswith((b"--- ", b"+++ ")):
+            # 空白を含むパスには末尾にタブが付きます。
+            path = _unquote_git_path(line[4:].rstrip(b"\t"))[0]
+            if path == b"/dev/null":
+                continue
+            # get_diff が接頭辞を a/ と b/ に固定しているため、先頭 2 文字を外します。
+            if line.startswith(b"+++ "):
+                return path[2:]
+            source = path[2:]
+    if source is not None:
+        return source
+
+    if header_line.startswith(b'"'):
+        _old, remainder = _unquote_git_path(header_line)
+        return _unquote_git_path(remainder)[0][2:]
+    if header_line.endswith(b'"'):
+        return _unquote_git_path(header_line[header_line.rfind(b' "') + 1:])[0][2:]
+    # "a/P b/P" の形です。P が " b/" を含んでも長さから区切り位置が決まります。
+    name_length = (len(header_line) - 5) // 2
+    if (
+        name_length > 0
+        and header_line.startswith(b"a/")
+        and header_line[2 + name_length:5 + name_length] == b" b/"
+        and header_line[2:2 + name_length] == header_line[5 + name_length:]
+    ):
+        return header_line[5 + name_length:]
+    return None
+
+
+def split_diff_by_file(diff):
     """unified diff をファイルごとのチャンクに分割します。
 
+    *diff* が ``bytes`` ならチャンクも ``bytes`` のまま返します (キーのパスだけデコードします)。
+    キーのパスは git のクォート (``core.quotepath``) を外したものです。
+
     Parameters
     ----------
-    diff: str
+    diff: str | bytes
         ``git diff`` の出力 (unified diff 形式) です。
 
     Returns
     -------
-    dict[str, str]
+    dict[str, str] | dict[str, bytes]
         ファイル パスをキー、そのファイルの diff チャンクを値とする辞書です。
     """
-    chunks: dict[str, str] = {}
-    current_path: str | None = None
-    current_lines: list[str] = []
-
-    for line in diff.splitlines(keepends=True):
-        if line.startswith("diff --git "):
-            if current_path is not None:
-                chunks[current_path] = "".join(current_lines)
-            # b/ パスを抽出します: 'diff --git a/foo b/bar' -> 'bar'
-            header_parts = line.strip().split(" b/", 1)
-            current_path = header_parts[1] if len(header_parts) == 2 else None
-            current_lines = [line]
-        else:
-            current_lines.append(line)
+    is_bytes = isinstance(diff, bytes)
+    header = b"diff --git " if is_bytes else "diff --git "
+    newline = b"\n" if is_bytes else "\n"
+    # 行ごとに走査せず、セクション境界の "\ndiff --git " で一括分割します。
+    sections = diff.split(newline + header)
+    if sections[0].startswith(header):
+        sections[0] = sections[0][len(header):]
+    else:
+        # 最初の diff ヘッダーより前の部分は捨てます。
+        sections = sections[1:]
+
+    chunks: dict = {}
+    last_index = len(sections) - 1
+    for index, section in enumerate(sections):
+        raw_path = _diff_section_path(section if is_bytes else section.encode("utf-8"))
+        if raw_path is None:
+            continue
+        path = raw_path.decode("utf-8", "replace")
+        chunk = header + section
+        chunks[path] = chunk if index == last_index else chunk + newline
+
+    return chunks
+
+
+class DiffChunks(Mapping):
+    """ファイル パスから diff チャンク (``str``) を引く読み取り専用の辞書です。
+
+    チャンクはバイト列で保持し、初めて参照されたときにデコードして記憶します。
+    ルールに一致しないファイルのチャンクはデコードしません。
+
+    Parameters
+    ----------
+    raw_chunks: dict[str, bytes]
+        ファイル パスをキー、バイト列の diff チャンクを値とする辞書です。
+    """
+
+    def __init__(self, raw_chunks: dict[str, bytes]) -> None:
+        self._raw = raw_chunks
+        self._decoded: dict[str, str] = {}
+
+    def __getitem__(self, path: str) -> str:
+        text = self._decoded.get(path)
+        if text is None:
+            text = self._decoded[path] = self._raw[path].decode("utf-8", "replace")
+        return text
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def raw(self, path: str) -> bytes:
+        """*path* のチャンクをデコードせずに返します。"""
+        return self._raw[path]
+
+
+@dataclass
+class DiffSnapshot:
+    """1 回の ``git diff`` から得た変更ファイル一覧とファイルごとの diff チャンクです。
+
+    Parameters
+    ----------
+    changed_files: list[str]
+        変更されたファイル パスのリストです (削除されたファイルを除く)。
+    diff_chunks: DiffChunks
+        ファイル パスをキー、diff チャンクを値とする辞書です。チャンクは参照時にデコードします。
+    """
+
+    changed_files: list[str]
+    diff_chunks: DiffChunks
+
+    @classmethod
+    def capture(cls, staged: bool, pathspecs: list[str] | None = None) -> "DiffSnapshot":
+        """``git diff`` を 1 回だけ実行してスナップショットを作ります。
+
+        変更ファイル一覧は ``git diff --name-only --diff-filter=d`` を別途実行せず、
+        diff の各セクションから削除 (``deleted file mode``) を除いて求めます。
+
+        Parameters
+        ----------
+        staged: bool
+            ``True`` なら staged な変更、``False`` なら working な変更を対象にします。
+        pathspecs: list[str] | None
+            ``git diff`` に渡す pathspec です。``None`` なら全ファイルを対象にします。
+
+        Returns
+        -------
+        DiffSnapshot
+            スナップショットです。差分がなければどちらも空です。
+        """
+        raw_chunks = split_diff_by_file(get_diff(staged, pathspecs))
+        changed_files = [
+            path for path, chunk in raw_chunks.items()
+            if not chunk.partition(b"\n")[2].startswith(b"deleted file mode")
+        ]
+        return cls(changed_files=changed_files, diff_chunks=DiffChunks(raw_chunks))
+
+
+# ``##`` 見出し行 (group 1 が見出しテキスト) か、コード フェンス行 (group 1 は None) に一致します。
+_RULE_HEADING_OR_FENCE_RE = re.compile(r"^## (.*)$|^[^\S\n]*(?:```|~~~)", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=1024)
+def extract_rule_headings(rule_body: str) -> tuple[str, ...]:
+    """チェックリスト用にルール本文から ``##`` 見出しを抽出します。
+
+    per-file プロンプトではファイルごとに呼ばれるため、ルール本文ごとに結果を記憶します。
+
+    Parameters
+    ----------
+    rule_body: str
+        ルール ファイルの本文 (フロント マター除去済み) です。
+
+    Returns
+    -------
+    tuple[str, ...]
+        見出しテキストのタプルです。コード ブロック内の見出しはスキップします。
+    """
+    headings = []
+    in_code_block = False
+    # 全行を Python で走査せず、コード フェンス行と見出し行だけを正規表現で拾います。
+    for match in _RULE_HEADING_OR_FENCE_RE.finditer(rule_body):
+        heading = match.group(1)
+        if heading is None:
+            in_code_block = not in_code_block
+        elif not in_code_block:
+            headings.append(heading.strip())
+    return tuple(headings)
+
 
-    if current_path is not None:
-        chunks[current_path] = "".join(current_lines)
+_HUNK_HEADER_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@", re.MULTILINE)
 
-    return chunks
 
+@functools.lru_cache(maxsize=256)
+def build_diff_context(
+    file_content: str,
+    file_diff: str,
+    window: int = DIFF_CONTEXT_WINDOW_LINES,
+    min_file_lines: int = DIFF_CONTEXT_MIN_FILE_LINES,
+) -> str | None:
+    """diff の各 hunk の前後 *window* 行だけを、ファイル全文から切り出します。
 
-def extract_rule_headings(rule_body: str) -> list[str]:
-    """チェックリスト用にルール本文から ``##`` 見出しを抽出します。
+    hunk ヘッダー (``@@ -a,b +c,d @@``) の変更後の行範囲を使い、重なる範囲はまとめます。
+    1 ファイルに複数のルールが適用されるとプロンプトごとに同じ抜粋が必要になるため、
+    結果はプロセス内で再利用します (ファイル全文の分割はファイルごとに 1 回で済みます)。
 
     Parameters
     ----------
-    rule_body: str
-        ルール ファイルの本文 (フロント マター除去済み) です。
+    file_content: str
+        変更後のファイルの全文です。
+    file_diff: str
+        ファイルの diff チャンクです。
+    window: int
+        各 hunk の前後に含める行数です。
+    min_file_lines: int
+        ファイルの行数がこれ以下なら切り出しません。
 
     Returns
     -------
-    list[str]
-        見出しテキストのリストです。コード ブロック内の見出しはスキップします。
+    str | None
+        ``--- lines <開始>-<終了> ---`` の見出しを付けた抜粋です。
+        全文を送るべき場合 (小さいファイル、hunk がない、抜粋が全文を覆う) は ``None`` です。
     """
-    headings = []
-    in_code_block = False
-    for line in rule_body.splitlines():
-        stripped = line.strip()
-        if stripped.startswith("```") or stripped.startswith("~~~"):
-            in_code_block = not in_code_block
-            continue
-        if not in_code_block and line.startswith("## "):
-            headings.append(line[3:].strip())
-    return headings
+    lines = file_content.split("\n")
+    if len(lines) <= min_file_lines:
+        return None
+
+    ranges: list[list[int]] = []
+    for match in _HUNK_HEADER_RE.finditer(file_diff or ""):
+        start = int(match.group(1))
+        count = int(match.group(2)) if match.group(2) is not None else 1
+        first = max(1, start - window)
+        last = min(len(lines), start + max(count, 1) - 1 + window)
+        if ranges and first <= ranges[-1][1] + 1:
+            ranges[-1][1] = max(ranges[-1][1], last)
+        else:
+            ranges.append([first, last])
+    if not ranges or (ranges[0][0] == 1 and ranges[0][1] == len(lines)):
+        return None
+
+    writer = io.StringIO()
+    for first, last in ranges:
+        writer.write(f"--- lines {first}-{last} ---\n")
+        writer.write("\n".join(lines[first - 1:last]))
+        writer.write("\n")
+    return writer.getvalue()
 
 
 def build_prompt_for_single_file(
@@ -1829,74 +3284,88 @@ def build_prompt_for_single_file(
         構築されたプロンプト文字列です。
     """
     headings = extract_rule_headings(rule_body)
+    diff_context = None if full_scan else build_diff_context(file_content, file_diff)
 
-    scope_instruction = (
-        "Check the entire file content against the rules. All code in the file is the check target."
-        if full_scan
-        else "The diff is the primary check target. The full file content is provided for context only."
-    )
-    parts = [
-        "You are a strict AI validator. You MUST check every rule listed for the file. Do not skip any rule.",
-        scope_instruction,
-        "If you are uncertain whether something is a violation, report it with a note that it needs confirmation.",
-        "Be specific: state the file, line, and which rule is violated.",
-        "If there are no violations, respond with exactly: 'No violations found.'",
-        "",
-    ]
+    if full_scan:
+        scope_instruction = "Check the entire file content against the rules. All code in the file is the check target."
+    elif diff_context is not None:
+        scope_instruction = (
+            "The diff is the primary check target. "
+            "Excerpts of the file around the changes are provided for context only."
+        )
+    else:
+        scope_instruction = "The diff is the primary check target. The full file content is provided for context only."
+    # 部品のリストを作ってから join すると大きなファイル内容を 2 回コピーするため、直接書き込みます。
+    writer = io.StringIO()
+
+    def emit(text: str = "") -> None:
+        writer.write(text)
+        writer.write("\n")
+
+    # ファイルに依存しない部分を先頭に置き、同じルールのプロンプト間で共通の接頭辞にします。
+    emit("You are a strict AI validator. You MUST check every rule listed for the file. Do not skip any rule.")
+    emit("If you are uncertain whether something is a violation, report it with a note that it needs confirmation.")
+    emit("Be specific: state the file, line, and which rule is violated.")
+    emit("If there are no violations, respond with exactly: 'No violations found.'")
+    emit()
 
     if headings:
-        parts.append("## Rules Checklist")
-        parts.append("You must check each of the following rules:")
+        emit("## Rules Checklist")
+        emit("You must check each of the following rules:")
         for heading in headings:
-            parts.append(f"- [ ] {heading}")
-        parts.append("")
+            emit(f"- [ ] {heading}")
+        emit()
 
-    parts.append(f"=== RULE: {rule_name} ===")
-    parts.append(rule_body)
-    parts.append("")
+    emit(f"=== RULE: {rule_name} ===")
+    emit(rule_body)
+    emit()
+
+    if suppressions:
+        emit("=== KNOWN SUPPRESSIONS ===")
+        emit("以下は既知の例外です。これらに該当する場合は違反として報告しないでください。")
+        emit(suppressions)
+        emit()
 
-    parts.append(f"=== FILE: {file_path} ===")
-    parts.append("")
+    emit(scope_instruction)
+    emit()
+    emit(f"=== FILE: {file_path} ===")
+    emit()
 
     if full_scan:
-        parts.append("--- Full Content (primary check target) ---")
-        parts.append(file_content)
-        parts.append("")
+        emit("--- Full Content (primary check target) ---")
+        emit(file_content)
+        emit()
     else:
-        parts.append("--- Changes (primary check target) ---")
-        parts.append(file_diff if file_diff else "(no diff available for this file)")
-        parts.append("")
-        parts.append("--- Full Content (for context) ---")
-        parts.append(file_content)
-        parts.append("")
-
-    if suppressions:
-        parts.append("=== KNOWN SUPPRESSIONS ===")
-        parts.append("以下は既知の例外です。これらに該当する場合は違反として報告しないでください。")
-        parts.append(suppressions)
-        parts.append("")
+        emit("--- Changes (primary check target) ---")
+        emit(file_diff if file_diff else "(no diff available for this file)")
+        emit()
+        if diff_context is not None:
+            emit("--- Excerpts Around Changes (for context) ---")
+            emit(diff_context)
+        else:
+            emit("--- Full Content (for context) ---")
+            emit(file_content)
+        emit()
 
-    parts.append("## Reminder")
-    parts.append("Confirm that you have checked every rule in the checklist above.")
-    parts.append("Do not skip any rule. Report all violations found.")
+    emit("## Reminder")
+    emit("Confirm that you have checked every rule in the checklist above.")
+    writer.write("Do not skip any rule. Report all violations found.")
 
-    return "\n".join(parts)
+    return writer.getvalue()
 
 
-def check_single_rule_single_file(
+def resolve_unit_cache_key(
     rule_name: str,
     rule_body: str,
     file_path: str,
     file_content: str,
     file_diff: str,
     suppressions: str,
-    cache: CacheStore,
     full_scan: bool = False,
-    model: str = DEFAULT_MODEL,
     context_level: str = "diff",
-    cache_enabled: bool = True,
-) -> tuple[str, str, str, str, bool]:
-    """1 つのルールを 1 つのファイルに対してチェックします。
+    content_digest: str = "",
+) -> tuple[str, bool]:
+    """1 ルール × 1 ファイルのチェック単位について、キャッシュ キーと全文送信の有無を決めます。
 
     Parameters
     ----------
@@ -1912,17 +3381,17 @@ def check_single_rule_single_file(
         ファイルの diff チャンクです。
     suppressions: str
         suppressions の内容です。
-    cache: CacheStore
-        キャッシュ ストアです。
     full_scan: bool
         ``True`` ならフル スキャン モードです。
-    model: str
-        ``claude -p`` で使用するモデル名です。
+    context_level: str
+        ``diff`` / ``smart`` / ``full_file`` のいずれかです。
+    content_digest: str
+        ファイル全文の blob ID です。
 
     Returns
     -------
-    tuple[str, str, str, str, bool]
-        ``(rule_name, file_path, status, message, cache_hit)`` です。
+    tuple[str, bool]
+        ``(cache_key, use_full_content)`` です。
     """
     effective_context = context_level if context_level in SUPPORTED_CONTEXT_LEVELS else "diff"
     use_full_content = full_scan
@@ -1935,18 +3404,113 @@ def check_single_rule_single_file(
             use_full_content = (diff_len == 0) or (content_len > 0 and diff_len > content_len * 0.6)
 
     mode = "full-scan" if use_full_content else "stream"
-    diff_or_content = file_content if use_full_content else file_diff
+    if use_full_content:
+        diff_or_content = file_content
+    else:
+        # diff の index 行は落としますが、プロンプトに文脈として載せる部分 (hunk 周辺の抜粋、
+        # 抜粋しない場合はファイル全文) はキーに含めます。文脈が変われば判定も変わり得るためです。
+        diff_context = build_diff_context(file_content, file_diff)
+        if diff_context is not None:
+            context_id = "excerpt:" + _hash_text(diff_context)
+        elif content_digest:
+            context_id = "blob:" + content_digest
+        else:
+            context_id = "content:" + _hash_text(file_content)
+        diff_or_content = normalize_diff_for_cache(file_diff) + "\n" + context_id
     cache_key = compute_cache_key(
         rule_name, rule_body, diff_or_content, suppressions,
         mode=mode, per_file=True, file_path=file_path,
+        content_digest=content_digest if use_full_content else "",
+    )
+    return cache_key, use_full_content
+
+
+def cached_unit_result(rule_name: str, file_path: str, cached: str) -> tuple[str, str, str, str, bool]:
+    """キャッシュ済みのメッセージから、チェック単位の結果タプルを作ります。
+
+    Parameters
+    ----------
+    rule_name: str
+        ルール ファイル名です。
+    file_path: str
+        チェック対象のファイル パスです。
+    cached: str
+        キャッシュされていたメッセージです。
+
+    Returns
+    -------
+    tuple[str, str, str, str, bool]
+        ``(rule_name, file_path, status, message, True)`` です。
+    """
+    is_clean = "[action required]" not in cached.lower()
+    status = "allow" if is_clean else "deny"
+    return rule_name, file_path, status, cached, True
+
+
+def check_single_rule_single_file(
+    rule_name: str,
+    rule_body: str,
+    file_path: str,
+    file_content: str,
+    file_diff: str,
+    suppressions: str,
+    cache: CacheStore,
+    full_scan: bool = False,
+    model: str = DEFAULT_MODEL,
+    context_level: str = "diff",
+    cache_enabled: bool = True,
+    content_digest: str = "",
+    keywords: tuple[str, ...] = (),
+) -> tuple[str, str, str, str, bool]:
+    """1 つのルールを 1 つのファイルに対してチェックします。
+
+    Parameters
+    ----------
+    rule_name: str
+        ルール ファイル名です。
+    rule_body: str
+        ルール本文です。
+    file_path: str
+        チェック対象のファイル パスです。
+    file_content: str
+        ファイルの全文です。
+    file_diff: str
+        ファイルの diff チャンクです。
+    suppressions: str
+        suppressions の内容です。``suppressions_for_rule`` でこのルールに関係する部分だけを使います。
+    cache: CacheStore
+        キャッシュ ストアです。
+    full_scan: bool
+        ``True`` ならフル スキャン モードです。
+    model: str
+        ``claude -p`` で使用するモデル名です。
+    content_digest: str
+        ファイル全文の blob ID です。全文を送る場合にキャッシュ キーで全文のハッシュの代わりに使います。
+    keywords: tuple[str, ...]
+        ルールの事前フィルター用キーワードです。どれもファイルに現れなければ ``claude -p`` を実行せずに allow を返します。
+
+    Returns
+    -------
+    tuple[str, str, str, str, bool]
+        ``(rule_name, file_path, status, message, cache_hit)`` です。
+    """
+    if keywords and not any(keyword in file_content for keyword in keywords):
+        message = (
+            f"[Rule: {rule_name} | File: {file_path}]\n"
+            "No violations found. (Skipped: none of the rule keywords appear in this file.)"
+        )
+        return rule_name, file_path, "allow", message, False
+
+    suppressions = suppressions_for_rule(suppressions, rule_name)
+    cache_key, use_full_content = resolve_unit_cache_key(
+        rule_name, rule_body, file_path, file_content, file_diff, suppressions,
+        full_scan=full_scan, context_level=context_level, content_digest=content_digest,
     )
 
     if cache_enabled:
         cached = cache.get(cache_key)
         if cached is not None:
-            is_clean = "[action required]" not in cached.lower()
-            status = "allow" if is_clean else "deny"
-            return rule_name, file_path, status, cached, True
+            return cached_unit_result(rule_name, file_path, cached)
 
     prompt = build_prompt_for_single_file(
         rule_name, rule_body, file_path, file_content, file_diff,
@@ -1987,7 +3551,10 @@ def output_result(decision: str, message: str = "") -> None:
     }
     if message:
         hook_output["additionalContext"] = message
-    print(json.dumps({"hookSpecificOutput": hook_output}))
+    # print を介さず、UTF-8 の JSON バイト列を 1 回で書き出します。
+    sys.stdout.flush()
+    sys.stdout.buffer.write(_dump_json({"hookSpecificOutput": hook_output}) + b"\n")
+    sys.stdout.buffer.flush()
 
 
 def emit_warnings(warnings: list[str], full_scan: bool) -> None:
@@ -2173,7 +3740,10 @@ def _watch_diff_fingerprint(diff_chunks: dict[str, str]) -> str:
     for path in sorted(diff_chunks.keys()):
         h.update(path.encode("utf-8"))
         h.update(b"\n")
-        h.update(diff_chunks[path].encode("utf-8"))
+        if isinstance(diff_chunks, DiffChunks):
+            h.update(diff_chunks.raw(path))
+        else:
+            h.update(diff_chunks[path].encode("utf-8"))
         h.update(b"\n")
     return h.hexdigest()
 
@@ -2234,7 +3804,7 @@ def _watch_priority_from_recent_queue(root: Path, target_files: list[str]) -> in
 
     target_set = set(target_files)
     best = WATCH_PRIORITY_NORMAL
-    for _path, state, _priority, _status in _list_queue_states(queue_dir):
+    for _path, state, _priority, _status in _list_queue_states(queue_dir, ordered=False):
         state_target = str(state.get("target_file_path", ""))
         if state_target not in target_set:
             continue
@@ -2266,7 +3836,7 @@ def _load_watch_priority_stats(root: Path) -> dict:
 
 def _save_watch_priority_stats(root: Path, stats: dict) -> None:
     path = _watch_priority_stats_path(root)
-    _write_json_atomically(path, stats)
+    _write_json_atomically(path, stats, durable=False)
 
 
 def _watch_priority_from_history_stats(root: Path, target_files: list[str], ttl_seconds: int) -> int:
@@ -2598,6 +4168,7 @@ def run_watch_mode(args: argparse.Namespace) -> None:
 def resolve_target_files(
     staged: bool,
     full_scan: bool,
+    pathspecs: list[str] | None = None,
 ) -> tuple[list[str], dict[str, str]]:
     """実行モードに基づいてチェック対象ファイルと diff チャンクを決定します。
 
@@ -2607,6 +4178,9 @@ def resolve_target_files(
         staged モードかどうかです。
     full_scan: bool
         フル スキャン モードかどうかです。
+    pathspecs: list[str] | None
+        diff を取得するパスを絞り込む pathspec です (``rule_diff_pathspecs`` の戻り値)。
+        フル スキャン時は使いません。
 
     Returns
     -------
@@ -2620,19 +4194,53 @@ def resolve_target_files(
             print("No tracked files found.", file=sys.stderr)
         return target_files, {}
 
-    diff = get_diff(staged)
-    if not diff:
-        return [], {}
-    target_files = get_changed_files(staged)
-    if not target_files:
+    snapshot = DiffSnapshot.capture(staged, pathspecs)
+    if not snapshot.changed_files:
         return [], {}
-    return target_files, split_diff_by_file(diff)
+    return snapshot.changed_files, snapshot.diff_chunks
+
+
+def _has_binary_suffix(file_path: str) -> bool:
+    """拡張子だけでバイナリと判定できるファイルなら ``True`` を返します。"""
+    return os.path.splitext(_basename(file_path))[1].lower() in BINARY_FILE_SUFFIXES
+
+
+def prepare_file_digests(
+    full_scan: bool,
+    context_level: str,
+    base_dir: Path,
+) -> tuple[dict[str, str] | None, FileDigestCache | None]:
+    """``load_file_contents`` に渡す blob ID の格納先とスタンプ キャッシュを用意します。
+
+    blob ID は全文を送るモード (full scan、``full_file``、``smart``) のキャッシュ キーだけで使います。
+
+    Parameters
+    ----------
+    full_scan: bool
+        full scan モードかどうかです。
+    context_level: str
+        コンテキスト レベルです。
+    base_dir: Path
+        ``.complete-validator/`` を置くディレクトリです (通常は git toplevel)。
+
+    Returns
+    -------
+    tuple[dict[str, str] | None, FileDigestCache | None]
+        ``(digests, digest_cache)`` です。blob ID が不要なら両方 ``None`` です。
+    """
+    if not (full_scan or context_level in ("full_file", "smart")):
+        return None, None
+    digest_cache = FileDigestCache(path=base_dir / ".complete-validator" / "file-digests.json")
+    digest_cache.load()
+    return {}, digest_cache
 
 
 def load_file_contents(
     file_paths: list[str],
     staged: bool,
     full_scan: bool,
+    digests: dict[str, str] | None = None,
+    digest_cache: FileDigestCache | None = None,
 ) -> dict[str, str]:
     """指定されたパスのファイル内容を読み込みます。
 
@@ -2644,26 +4252,224 @@ def load_file_contents(
         ``True`` なら staged 版を取得します。
     full_scan: bool
         ``True`` なら作業ツリーから直接読み込みます。
+    digests: dict[str, str] | None
+        指定すると、読み込んだバイト列そのものから求めた blob ID を格納します。
+        キャッシュ キーと送る内容が必ず同じ版を指すように、別途読み直さずにここで求めます。
+        作業ツリーの読み込み中にファイルが変わった場合は格納しません。
+    digest_cache: FileDigestCache | None
+        作業ツリーの blob ID をスタンプで再利用するキャッシュです。``None`` なら毎回ハッシュします。
 
     Returns
     -------
     dict[str, str]
-        ファイル パスをキー、内容を値とする辞書です。読み込めなかったファイルは除外されます。
+        ファイル パスをキー、内容を値とする辞書です。読み込めなかったファイルとバイナリ ファイルは除外されます。
     """
     contents: dict[str, str] = {}
-    for file_path in file_paths:
+    file_paths = [file_path for file_path in file_paths if not _has_binary_suffix(file_path)]
+    if staged and not full_scan:
+        # staged 版は 1 回の cat-file 往復でまとめて読み出します。
+        blobs = GIT_CAT_FILE.read_blobs([f":{file_path}" for file_path in file_paths])
+        for file_path, blob in zip(file_paths, blobs):
+            if blob is None or b"\0" in blob[:BINARY_SNIFF_BYTES]:
+                continue
+            try:
+                file_content = _staged_blob_text(blob)
+            except UnicodeDecodeError:
+                continue
+            if file_content.strip():
+                contents[file_path] = file_content
+                if digests is not None:
+                    digests[file_path] = _git_blob_id(blob)
+        return contents
+
+    def read_working_file(file_path: str) -> tuple[str, str | None] | None:
+        # 先頭だけ読んでバイナリを判定し、バイナリなら残りを読まずに捨てます。
         try:
-            if full_scan:
-                file_content = Path(file_path).read_text(encoding="utf-8")
-            else:
-                file_content = get_file_content(file_path, staged)
+            with open(file_path, "rb") as stream:
+                before = os.fstat(stream.fileno())
+                head = stream.read(BINARY_SNIFF_BYTES)
+                if b"\0" in head:
+                    return None
+                data = head + stream.read()
+                after = os.fstat(stream.fileno())
+            text = data.decode("utf-8")
         except (OSError, UnicodeDecodeError):
-            continue
-        if file_content:
-            contents[file_path] = file_content
+            return None
+        digest = None
+        # 読んでいる途中で書き換えられたファイルは、どの版の blob ID か決められないため求めません。
+        if (
+            digests is not None
+            and before.st_mtime_ns == after.st_mtime_ns
+            and before.st_size == after.st_size == len(data)
+        ):
+            if digest_cache is not None:
+                digest = digest_cache.digest_for(file_path, after.st_mtime_ns, after.st_size, data)
+            else:
+                digest = _git_blob_id(data)
+        return _normalize_newlines(text), digest
+
+    # 作業ツリーの読み込みは I/O 待ちが主なので、スレッドで並列に発行します。
+    workers = max(1, min(FILE_READ_MAX_WORKERS, len(file_paths)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for file_path, loaded in zip(file_paths, executor.map(read_working_file, file_paths)):
+            if loaded is None or not loaded[0]:
+                continue
+            contents[file_path] = loaded[0]
+            if digests is not None and loaded[1] is not None:
+                digests[file_path] = loaded[1]
     return contents
 
 
+def resolve_cached_units(
+    units: list[tuple[str, str, str]],
+    files: dict[str, str],
+    diff_chunks: dict[str, str],
+    suppressions: str,
+    cache: CacheStore,
+    full_scan: bool,
+    context_level: str,
+    file_digests: dict[str, str] | None,
+    rule_keywords: dict[str, tuple[str, ...]] | None = None,
+) -> tuple[list[tuple[tuple[str, str, str], tuple[str, str, str, str, bool]]], list[tuple[str, str, str]]]:
+    """キャッシュ ヒットするチェック単位を呼び出し元のスレッドで解決し、残りの単位と分けます。
+
+    ヒットした単位はワーカー キューに積まずに結果を確定させるため、キャッシュが温まっていれば
+    スレッドの起動も ``claude -p`` の待ちも発生しません。キーワード事前フィルターで
+    スキップされる単位は ``check_single_rule_single_file`` と同じ結果にするため、ここでは引きません。
+
+    Returns
+    -------
+    tuple[list, list]
+        ``([(unit, result), ...], misses)`` です。result は ``check_single_rule_single_file`` と同じ形で、
+        misses は元の順序を保ったキャッシュ ミスの単位です。
+    """
+    lookups: list[tuple[tuple[str, str, str], str]] = []
+    for unit in units:
+        rule_name, rule_body, fp = unit
+        keywords = (rule_keywords or {}).get(rule_name, ())
+        if keywords and not any(keyword in files[fp] for keyword in keywords):
+            continue
+        cache_key, _use_full_content = resolve_unit_cache_key(
+            rule_name, rule_body, fp, files[fp], diff_chunks.get(fp, ""), suppressions_for_rule(suppressions, rule_name),
+            full_scan=full_scan, context_level=context_level,
+            content_digest=(file_digests or {}).get(fp, ""),
+        )
+        lookups.append((unit, cache_key))
+
+    hits: list[tuple[tuple[str, str, str], tuple[str, str, str, str, bool]]] = []
+    hit_units: set[tuple[str, str, str]] = set()
+    for (unit, _cache_key), cached in zip(lookups, cache.multi_get([key for _unit, key in lookups])):
+        if cached is not None:
+            hits.append((unit, cached_unit_result(unit[0], unit[2], cached)))
+            hit_units.add(unit)
+    misses = [unit for unit in units if unit not in hit_units]
+    return hits, misses
+
+
+def order_units_by_severity(units: list[tuple[str, str, str]], rules: RuleList) -> list[tuple[str, str, str]]:
+    """ルール frontmatter の ``severity`` が高い単位から先に実行されるよう並べ替えます。
+
+    共有キューは先入れ先出しで、単位はすべて開始前に積むため、積む順序がそのまま
+    ``claude -p`` に渡る順序になります。同じ severity の中では元の順序を保ちます。
+
+    Parameters
+    ----------
+    units: list[tuple[str, str, str]]
+        ``(rule_name, rule_body, file_path)`` のリストです。
+    rules: RuleList
+        ルールのリストです。
+
+    Returns
+    -------
+    list[tuple[str, str, str]]
+        並べ替えた単位のリストです。
+    """
+    rule_priority = {
+        rule_name: _severity_priority(rule_options.get("severity", ""))
+        for rule_name, _patterns, _body, rule_options in rules
+    }
+    return sorted(units, key=lambda unit: rule_priority.get(unit[0], _severity_priority("")))
+
+
+def iter_unit_results(
+    units: list[tuple[str, str, str]],
+    run_unit,
+    max_workers: int,
+    deadline_ns: int,
+):
+    """チェック単位を共有キューから ``max_workers`` 個のワーカーで処理し、完了順に結果を返します。
+
+    ワーカー数は ``claude -p`` プールの大きさと同じにし、各ワーカーはキューが空になるまで
+    単位を取り出し続けます。*deadline_ns* を過ぎても結果が届かない場合は、未完了の単位を
+    ``TimeoutError`` として返して打ち切ります。
+
+    Parameters
+    ----------
+    units: list[tuple[str, str, str]]
+        ``(rule_name, rule_body, file_path)`` のリストです。
+    run_unit: Callable
+        1 単位を受け取り、``check_single_rule_single_file`` と同じ形の結果を返す関数です。
+    max_workers: int
+        ワーカー スレッド数の上限です。
+    deadline_ns: int
+        ``time.monotonic_ns()`` 基準の締め切り (ナノ秒) です。
+
+    Yields
+    ------
+    tuple[tuple[str, str, str], object]
+        ``(unit, result)`` です。例外が発生した単位では result が例外オブジェクトになります。
+    """
+    pending: queue.SimpleQueue = queue.SimpleQueue()
+    finished: queue.SimpleQueue = queue.SimpleQueue()
+    for unit in units:
+        pending.put(unit)
+    # 未着手の単位の数をプールに伝え、最後の単位を渡したあとの先行起動を止めます。
+    dispatch_lock = threading.Lock()
+    undispatched = len(units)
+    CLAUDE_POOL.set_queued(undispatched)
+
+    def worker() -> None:
+        nonlocal undispatched
+        while True:
+            with dispatch_lock:
+                try:
+                    unit = pending.get_nowait()
+                except queue.Empty:
+                    return
+                undispatched -= 1
+                CLAUDE_POOL.set_queued(undispatched)
+            try:
+                finished.put((unit, run_unit(unit)))
+            except Exception as e:
+                finished.put((unit, e))
+
+    for _ in range(max(1, min(len(units), max_workers))):
+        threading.Thread(target=worker, daemon=True).start()
+
+    remaining_units = {id(unit): unit for unit in units}
+    while remaining_units:
+        remaining_ns = deadline_ns - time.monotonic_ns()
+        timeout_seconds = max(MIN_FUTURE_TIMEOUT_SECONDS, remaining_ns / 1_000_000_000)
+        try:
+            unit, result = finished.get(timeout=timeout_seconds)
+        except queue.Empty:
+            break
+        remaining_units.pop(id(unit), None)
+        yield unit, result
+
+    # 締め切りで打ち切った場合は、未着手の単位を捨ててワーカーとプールの先行起動を止めます。
+    with dispatch_lock:
+        while True:
+            try:
+                pending.get_nowait()
+            except queue.Empty:
+                break
+        undispatched = 0
+        CLAUDE_POOL.set_queued(0)
+    for unit in remaining_units.values():
+        yield unit, TimeoutError("Deadline exceeded before the check finished.")
+
+
 def run_parallel_checks(
     rules: RuleList,
     target_files: list[str],
@@ -2678,6 +4484,7 @@ def run_parallel_checks(
     context_level: str = "diff",
     cache_enabled: bool = True,
     batching_enabled: bool = False,
+    file_digests: dict[str, str] | None = None,
 ) -> list[tuple[str, str, str]]:
     """per-file 単位でルール チェックを並列実行し、結果を収集します。
 
@@ -2704,22 +4511,19 @@ def run_parallel_checks(
         ``claude -p`` の同時起動数の上限です。
     model: str
         ``claude -p`` で使用するモデル名です。
+    file_digests: dict[str, str] | None
+        ファイル パスをキー、blob ID を値とする辞書です。全文モードのキャッシュ キーに使います。
 
     Returns
     -------
     list[tuple[str, str, str]]
         ``(rule_name, status, message)`` のリスト (ルール名でソート済み) です。
     """
-    deadline = time.monotonic() + (FULL_SCAN_DEADLINE_SECONDS if full_scan else HOOK_DEADLINE_SECONDS)
+    deadline_seconds = FULL_SCAN_DEADLINE_SECONDS if full_scan else HOOK_DEADLINE_SECONDS
+    deadline_ns = time.monotonic_ns() + deadline_seconds * 1_000_000_000
 
     # (rule_name, rule_body, file_path) のペアを列挙します。
-    units: list[tuple[str, str, str]] = []
-    for rule_name, rule_patterns, rule_body, rule_options in rules:
-        file_pool = _rule_target_pool(rule_options, target_files, cross_file_targets)
-        matched = files_matching_patterns(rule_patterns, file_pool)
-        matched = [fp for fp in matched if fp in files]
-        for fp in matched:
-            units.append((rule_name, rule_body, fp))
+    units = enumerate_rule_units(rules, target_files, files, cross_file_targets)
 
     if not units:
         return []
@@ -2727,33 +4531,43 @@ def run_parallel_checks(
     if batching_enabled:
         units.sort(key=lambda item: (item[2], item[0]))
 
-    # per-file 結果を収集します。
-    per_file_results: list[tuple[str, str, str, str, bool]] = []
+    rule_keywords = {
+        rule_name: tuple(rule_options.get("keywords", ()))
+        for rule_name, _patterns, _body, rule_options in rules
+    }
+    cached_results: list = []
+    pending_units = units
+    if cache_enabled:
+        cached_results, pending_units = resolve_cached_units(
+            units, files, diff_chunks, suppressions, cache,
+            full_scan, context_level, file_digests, rule_keywords,
+        )
 
-    with ThreadPoolExecutor(max_workers=min(len(units), max_workers)) as executor:
-        futures = {}
-        for rule_name, rule_body, fp in units:
-            future = executor.submit(
-                check_single_rule_single_file,
-                rule_name, rule_body, fp,
-                files[fp], diff_chunks.get(fp, ""),
-                suppressions, cache,
-                full_scan=full_scan,
-                model=model,
-                context_level=context_level,
-                cache_enabled=cache_enabled,
-            )
-            futures[future] = (rule_name, fp)
+    def run_unit(unit: tuple[str, str, str]) -> tuple[str, str, str, str, bool]:
+        rule_name, rule_body, fp = unit
+        return check_single_rule_single_file(
+            rule_name, rule_body, fp,
+            files[fp], diff_chunks.get(fp, ""),
+            suppressions, cache,
+            full_scan=full_scan,
+            model=model,
+            context_level=context_level,
+            cache_enabled=cache_enabled,
+            content_digest=(file_digests or {}).get(fp, ""),
+            keywords=rule_keywords.get(rule_name, ()),
+        )
 
-        for future in as_completed(futures):
-            remaining_seconds = deadline - time.monotonic()
-            timeout_seconds = max(MIN_FUTURE_TIMEOUT_SECONDS, remaining_seconds)
-            try:
-                result = future.result(timeout=timeout_seconds)
-                per_file_results.append(result)
-            except Exception as e:
-                failed_rule, failed_file = futures[future]
-                per_file_results.append((failed_rule, failed_file, "error", f"[{failed_rule}:{failed_file}] Error: {e}", False))
+    # per-file 結果を収集します。
+    per_file_results: list[tuple[str, str, str, str, bool]] = []
+    unit_results = itertools.chain(
+        cached_results,
+        iter_unit_results(order_units_by_severity(pending_units, rules), run_unit, max_workers, deadline_ns),
+    )
+    for (failed_rule, _rule_body, failed_file), result in unit_results:
+        if isinstance(result, Exception):
+            per_file_results.append((failed_rule, failed_file, "error", f"[{failed_rule}:{failed_file}] Error: {result}", False))
+        else:
+            per_file_results.append(result)
 
     # ルール名ごとに集約します。
     by_rule: dict[str, list[tuple[str, str, str, bool]]] = defaultdict(list)
@@ -2796,6 +4610,7 @@ def run_stream_checks(
     context_level: str = "diff",
     cache_enabled: bool = True,
     batching_enabled: bool = False,
+    file_digests: dict[str, str] | None = None,
 ) -> None:
     """per-file 単位でルール チェックを並列実行し、結果をディスクに書き出します。
 
@@ -2823,6 +4638,8 @@ def run_stream_checks(
         ``claude -p`` の同時起動数の上限です。
     model: str
         ``claude -p`` で使用するモデル名です。
+    file_digests: dict[str, str] | None
+        ファイル パスをキー、blob ID を値とする辞書です。全文モードのキャッシュ キーに使います。
     """
     def log(msg: str) -> None:
         if log_file:
@@ -2830,13 +4647,7 @@ def run_stream_checks(
                 f.write(f"[{time.strftime('%H:%M:%S')}] {msg}\n")
 
     # (rule_name, rule_body, file_path) のペアを列挙します。
-    units: list[tuple[str, str, str]] = []
-    for rule_name, rule_patterns, rule_body, rule_options in rules:
-        file_pool = _rule_target_pool(rule_options, target_files, cross_file_targets)
-        matched = files_matching_patterns(rule_patterns, file_pool)
-        matched = [fp for fp in matched if fp in files]
-        for fp in matched:
-            units.append((rule_name, rule_body, fp))
+    units = enumerate_rule_units(rules, target_files, files, cross_file_targets)
 
     if not units:
         log("No rule-file units to check.")
@@ -2849,76 +4660,73 @@ def run_stream_checks(
 
     tracker = StreamStatusTracker(results_dir=results_dir, total_units=len(units))
     log(f"Starting {len(units)} units.")
-    deadline = time.monotonic() + STREAM_DEADLINE_SECONDS
-
-    with ThreadPoolExecutor(max_workers=min(len(units), max_workers)) as executor:
-        futures = {}
-        for rule_name, rule_body, fp in units:
-            future = executor.submit(
-                check_single_rule_single_file,
-                rule_name, rule_body, fp,
-                files[fp], diff_chunks.get(fp, ""),
-                suppressions, cache,
-                full_scan=full_scan,
-                model=model,
-                context_level=context_level,
-                cache_enabled=cache_enabled,
-            )
-            futures[future] = (rule_name, fp)
+    deadline_ns = time.monotonic_ns() + STREAM_DEADLINE_SECONDS * 1_000_000_000
 
-        for future in as_completed(futures):
-            remaining = deadline - time.monotonic()
-            timeout = max(MIN_FUTURE_TIMEOUT_SECONDS, remaining)
-            try:
-                r_rule, r_file, r_status, r_message, r_cache_hit = future.result(timeout=timeout)
-                write_result_file(results_dir, r_rule, r_file, r_status, r_message, r_cache_hit)
-                upsert_queue_state_from_stream_result(
-                    stream_id=stream_id,
-                    base_dir=results_dir.parent.parent,
-                    rule_name=r_rule,
-                    file_path=r_file,
-                    status=r_status,
-                    message=r_message,
-                    model=model,
-                    cache_hit=r_cache_hit,
-                )
-                write_violations_result_append(
-                    root=results_dir.parent.parent,
-                    stream_id=stream_id,
-                    rule_name=r_rule,
-                    file_path=r_file,
-                    status=r_status,
-                    message=r_message,
-                    cache_hit=r_cache_hit,
-                    model=model,
-                )
-                tracker.update(r_status)
-                log(f"[{r_status}] {r_rule} | {r_file} (cache={r_cache_hit})")
-            except Exception as e:
-                failed_rule, failed_file = futures[future]
-                write_result_file(results_dir, failed_rule, failed_file, "error", str(e), False)
-                upsert_queue_state_from_stream_result(
-                    stream_id=stream_id,
-                    base_dir=results_dir.parent.parent,
-                    rule_name=failed_rule,
-                    file_path=failed_file,
-                    status="error",
-                    message=str(e),
-                    model=model,
-                    cache_hit=False,
-                )
-                write_violations_result_append(
-                    root=results_dir.parent.parent,
-                    stream_id=stream_id,
-                    rule_name=failed_rule,
-                    file_path=failed_file,
-                    status="error",
-                    message=str(e),
-                    cache_hit=False,
-                    model=model,
-                )
-                tracker.update("error")
-                log(f"[error] {failed_rule} | {failed_file}: {e}")
+    rule_keywords = {
+        rule_name: tuple(rule_options.get("keywords", ()))
+        for rule_name, _patterns, _body, rule_options in rules
+    }
+    cached_results: list = []
+    pending_units = units
+    if cache_enabled:
+        cached_results, pending_units = resolve_cached_units(
+            units, files, diff_chunks, suppressions, cache,
+            full_scan, context_level, file_digests, rule_keywords,
+        )
+
+    def run_unit(unit: tuple[str, str, str]) -> tuple[str, str, str, str, bool]:
+        rule_name, rule_body, fp = unit
+        return check_single_rule_single_file(
+            rule_name, rule_body, fp,
+            files[fp], diff_chunks.get(fp, ""),
+            suppressions, cache,
+            full_scan=full_scan,
+            model=model,
+            context_level=context_level,
+            cache_enabled=cache_enabled,
+            content_digest=(file_digests or {}).get(fp, ""),
+            keywords=rule_keywords.get(rule_name, ()),
+        )
+
+    def record(unit: tuple[str, str, str], result) -> str:
+        """1 ユニットの結果をディスクへ書き出し、ステータスを返します。"""
+        failed_rule, _rule_body, failed_file = unit
+        if isinstance(result, Exception):
+            r_rule, r_file, r_status, r_message, r_cache_hit = failed_rule, failed_file, "error", str(result), False
+        else:
+            r_rule, r_file, r_status, r_message, r_cache_hit = result
+        write_result_file(results_dir, r_rule, r_file, r_status, r_message, r_cache_hit)
+        upsert_queue_state_from_stream_result(
+            stream_id=stream_id,
+            base_dir=results_dir.parent.parent,
+            rule_name=r_rule,
+            file_path=r_file,
+            status=r_status,
+            message=r_message,
+            model=model,
+            cache_hit=r_cache_hit,
+        )
+        write_violations_result_append(
+            root=results_dir.parent.parent,
+            stream_id=stream_id,
+            rule_name=r_rule,
+            file_path=r_file,
+            status=r_status,
+            message=r_message,
+            cache_hit=r_cache_hit,
+            model=model,
+        )
+        if isinstance(result, Exception):
+            log(f"[error] {r_rule} | {r_file}: {result}")
+        else:
+            log(f"[{r_status}] {r_rule} | {r_file} (cache={r_cache_hit})")
+        return r_status
+
+    # キャッシュ ヒットは一度に揃うため、進捗の記録を 1 回にまとめます。
+    tracker.update_batch([record(unit, result) for unit, result in cached_results])
+    ordered_units = order_units_by_severity(pending_units, rules)
+    for unit, result in iter_unit_results(ordered_units, run_unit, max_workers, deadline_ns):
+        tracker.update(record(unit, result))
 
     tracker.mark_completed()
     log("Stream completed.")
@@ -2976,7 +4784,7 @@ def handle_claim(args: argparse.Namespace) -> None:
         print(json.dumps({"ok": False, "error": "target violation not found or already claimed"}, ensure_ascii=False), file=sys.stderr)
         sys.exit(1)
 
-    state_path, state, priority, _status = sorted(candidates, key=lambda item: item[2])[0]
+    state_path, state, priority, _status = candidates[0]
     next_state = dict(state)
     next_state["status"] = ViolationStatus.IN_PROGRESS.value
     next_state["owner"] = owner
@@ -3335,8 +5143,7 @@ def main_stream(args: argparse.Namespace) -> None:
         パース済みの引数です。
     """
     stream_id = generate_stream_id()
-    git_toplevel = run_git("rev-parse", "--show-toplevel")
-    cache_dir = Path(git_toplevel) if git_toplevel else Path.cwd()
+    cache_dir = _repository_root()
     results_base = cache_dir / ".complete-validator" / "stream-results"
     results_base.mkdir(parents=True, exist_ok=True)
     results_dir = results_base / stream_id
@@ -3344,7 +5151,16 @@ def main_stream(args: argparse.Namespace) -> None:
 
     cleanup_old_stream_results(results_base)
 
-    # ワーカー プロセスを起動します。
+    if hasattr(os, "fork"):
+        # import 済みのモジュールをそのまま使えるよう、インタープリターを起動し直さずに fork します。
+        sys.stdout.flush()
+        sys.stderr.flush()
+        if os.fork() == 0:
+            _run_forked_stream_worker(args, stream_id, results_dir / "worker.log")
+        print(stream_id)
+        sys.exit(0)
+
+    # fork できない環境 (Windows) ではワーカー プロセスを起動します。
     worker_cmd = [
         sys.executable, __file__,
         "--stream-worker",
@@ -3373,6 +5189,49 @@ def main_stream(args: argparse.Namespace) -> None:
     sys.exit(0)
 
 
+def _run_forked_stream_worker(args: argparse.Namespace, stream_id: str, log_file: Path) -> None:
+    """fork した子プロセスでストリーム ワーカーを実行し、プロセスを終了します。
+
+    ``--stream-worker`` で起動した場合と同じく、新しいセッションで動き、stdin を閉じ、
+    stdout と stderr を *log_file* に向け、それ以外の継承した記述子を閉じ、
+    ``CLAUDECODE`` を環境変数から外します。
+    戻らずに ``SystemExit`` で終了するため、``atexit`` の後処理 (キャッシュの flush など) も実行されます。
+
+    Parameters
+    ----------
+    args: argparse.Namespace
+        親プロセスでパース済みの引数です。
+    stream_id: str
+        ストリーム ID です。
+    log_file: Path
+        ワーカー ログの出力先です。
+    """
+    os.setsid()
+    devnull_fd = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull_fd, 0)
+    os.close(devnull_fd)
+    log_fd = os.open(log_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    os.dup2(log_fd, 1)
+    os.dup2(log_fd, 2)
+    os.close(log_fd)
+    # subprocess の close_fds=True と同じく、0-2 以外の継承した記述子を閉じます。
+    # 呼び出し元のパイプを持ち続けると、EOF を待つ hook ランナーがワーカーの終了まで待たされます。
+    try:
+        max_fd = os.sysconf("SC_OPEN_MAX")
+    except (AttributeError, ValueError, OSError):
+        max_fd = 256
+    os.closerange(3, max_fd if max_fd > 0 else 256)
+    # 親が起動した git cat-file のパイプは閉じたので、子では新しく起動させます。
+    GIT_CAT_FILE._process = None
+    os.environ.pop("CLAUDECODE", None)
+
+    args.stream = False
+    args.stream_worker = True
+    args.stream_id = stream_id
+    main_stream_worker(args)
+    sys.exit(0)
+
+
 def main_stream_worker(args: argparse.Namespace) -> None:
     """ストリーム ワーカー プロセスとして実行します (main_stream から起動)。
 
@@ -3385,27 +5244,30 @@ def main_stream_worker(args: argparse.Namespace) -> None:
     full_scan = args.full_scan
     stream_id = args.stream_id
 
-    git_toplevel = run_git("rev-parse", "--show-toplevel")
-    cache_dir = Path(git_toplevel) if git_toplevel else Path.cwd()
+    cache_dir = _repository_root()
     results_dir = cache_dir / ".complete-validator" / "stream-results" / stream_id
     results_dir.mkdir(parents=True, exist_ok=True)
     log_file = results_dir / "worker.log"
+    # fork 起動ではコマンドラインが親と同じになるため、停止用に PID を残します。
+    (results_dir / "worker.pid").write_text(f"{os.getpid()}\n", encoding="utf-8")
 
-    target_files, diff_chunks = resolve_target_files(staged, full_scan)
-    if not target_files:
+    project_dirs = find_project_rules_dirs()
+    builtin_dir = args.plugin_dir / "rules" if args.plugin_dir else None
+    rules, _warnings = load_rules_cached(builtin_dir, project_dirs, cache_dir)
+    if not rules:
         tracker = StreamStatusTracker(results_dir=results_dir, total_units=0)
         tracker.mark_completed()
         return
 
-    project_dirs = find_project_rules_dirs()
-    builtin_dir = args.plugin_dir / "rules" if args.plugin_dir else None
-    rules, _warnings = merge_rules(builtin_dir, project_dirs)
-    if not rules:
+    # diff はルールのパターンに一致しうるパスだけに絞って取得します。
+    target_files, diff_chunks = resolve_target_files(staged, full_scan, rule_diff_pathspecs(rules))
+    if not target_files:
         tracker = StreamStatusTracker(results_dir=results_dir, total_units=0)
         tracker.mark_completed()
         return
 
-    if not any_file_matches_rules(rules, target_files):
+    rule_matched_files = select_rule_target_files(rules, target_files)
+    if not rule_matched_files:
         tracker = StreamStatusTracker(results_dir=results_dir, total_units=0)
         tracker.mark_completed()
         return
@@ -3421,37 +5283,28 @@ def main_stream_worker(args: argparse.Namespace) -> None:
     _rule_config = load_rule_config(cache_dir)
     suppressions = load_suppressions(cache_dir)
     cache = CacheStore(
-        path=cache_dir / ".complete-validator" / "cache.json",
+        path=cache_dir / ".complete-validator" / "cache",
         ttl_seconds=get_cache_ttl_seconds(config),
+        max_entries=get_cache_max_entries(config),
     )
     cache.load()
 
-    matched_target_files = [
-        fp for fp in target_files
-        if any(
-            any(fnmatch(os.path.basename(fp), pat) for pat in patterns)
-            for _name, patterns, _body, _rule_options in rules
-        )
-    ]
-    if cross_file_targets:
-        for fp in sorted(cross_file_targets):
-            if fp in matched_target_files:
-                continue
-            if any(
-                any(fnmatch(os.path.basename(fp), pat) for pat in patterns)
-                and bool(rule_options.get("cross_file", False))
-                for _name, patterns, _body, rule_options in rules
-            ):
-                matched_target_files.append(fp)
-    files = load_file_contents(matched_target_files, staged, full_scan)
+    matched_target_files = select_rule_target_files(
+        rules, target_files, cross_file_targets, matched_files=rule_matched_files,
+    )
+    context_level = get_context_level(config)
+    file_digests, digest_cache = prepare_file_digests(full_scan, context_level, cache_dir)
+    files = load_file_contents(matched_target_files, staged, full_scan, file_digests, digest_cache)
+    if digest_cache is not None:
+        digest_cache.save()
     if not files:
         tracker = StreamStatusTracker(results_dir=results_dir, total_units=0)
         tracker.mark_completed()
         return
 
     max_workers = get_max_workers(config)
+    CLAUDE_POOL.resize(max_workers)
     default_model = get_default_model(config)
-    context_level = get_context_level(config)
     cache_enabled = get_cache_enabled(config)
     batching_enabled = get_batching_enabled(config)
     run_stream_checks(
@@ -3465,6 +5318,7 @@ def main_stream_worker(args: argparse.Namespace) -> None:
         context_level=context_level,
         cache_enabled=cache_enabled,
         batching_enabled=batching_enabled,
+        file_digests=file_digests,
     )
 
 
@@ -3504,18 +5358,17 @@ def main() -> None:
     staged = args.staged
     full_scan = args.full_scan
 
-    git_toplevel = run_git("rev-parse", "--show-toplevel")
-    cache_dir = Path(git_toplevel) if git_toplevel else Path.cwd()
-
-    # チェック対象ファイルを解決します。
-    target_files, diff_chunks = resolve_target_files(staged, full_scan)
-    if not target_files:
-        sys.exit(0)
+    cache_dir = _repository_root()
 
     # ルールを読み込みます。
     project_dirs = find_project_rules_dirs()
     builtin_dir = args.plugin_dir / "rules" if args.plugin_dir else None
-    rules, warnings = merge_rules(builtin_dir, project_dirs)
+    rules, warnings = load_rules_cached(builtin_dir, project_dirs, cache_dir)
+
+    # チェック対象ファイルを解決します。diff はルールのパターンに一致しうるパスだけに絞って取得します。
+    target_files, diff_chunks = resolve_target_files(staged, full_scan, rule_diff_pathspecs(rules))
+    if not target_files:
+        sys.exit(0)
 
     if warnings and not rules:
         emit_warnings(warnings, full_scan)
@@ -3524,8 +5377,9 @@ def main() -> None:
     if not rules:
         sys.exit(0)
 
-    # どのルールにもマッチしないなら終了します。
-    if not any_file_matches_rules(rules, target_files):
+    # どのルールにもマッチしないなら終了します。照合結果は読み込むファイルの選択でも使います。
+    rule_matched_files = select_rule_target_files(rules, target_files)
+    if not rule_matched_files:
         if warnings:
             emit_warnings(warnings, full_scan)
         if full_scan:
@@ -3544,38 +5398,30 @@ def main() -> None:
     _rule_config = load_rule_config(cache_dir)
     suppressions = load_suppressions(cache_dir)
     cache = CacheStore(
-        path=cache_dir / ".complete-validator" / "cache.json",
+        path=cache_dir / ".complete-validator" / "cache",
         ttl_seconds=get_cache_ttl_seconds(config),
+        max_entries=get_cache_max_entries(config),
     )
     cache.load()
 
     # いずれかのルールにマッチするファイルだけ内容を読み込みます。
-    matched_target_files = [
-        file_path for file_path in target_files
-        if any(
-            any(fnmatch(os.path.basename(file_path), pat) for pat in patterns)
-            for _name, patterns, _body, _rule_options in rules
-        )
-    ]
-    if cross_file_targets:
-        for file_path in sorted(cross_file_targets):
-            if file_path in matched_target_files:
-                continue
-            if any(
-                any(fnmatch(os.path.basename(file_path), pat) for pat in patterns)
-                and bool(rule_options.get("cross_file", False))
-                for _name, patterns, _body, rule_options in rules
-            ):
-                matched_target_files.append(file_path)
-    files = load_file_contents(matched_target_files, staged, full_scan)
+    matched_target_files = select_rule_target_files(
+        rules, target_files, cross_file_targets, matched_files=rule_matched_files,
+    )
+    # 全文を送るモードでは、読み込んだ内容からキャッシュ キー用の blob ID も求めます。
+    context_level = get_context_level(config)
+    file_digests, digest_cache = prepare_file_digests(full_scan, context_level, cache_dir)
+    files = load_file_contents(matched_target_files, staged, full_scan, file_digests, digest_cache)
+    if digest_cache is not None:
+        digest_cache.save()
 
     if not files:
         sys.exit(0)
 
     # チェックを実行し結果を出力します。
     max_workers = get_max_workers(config)
+    CLAUDE_POOL.resize(max_workers)
     default_model = get_default_model(config)
-    context_level = get_context_level(config)
     cache_enabled = get_cache_enabled(config)
     batching_enabled = get_batching_enabled(config)
     results = run_parallel_checks(
@@ -3586,6 +5432,7 @@ def main() -> None:
         context_level=context_level,
         cache_enabled=cache_enabled,
         batching_enabled=batching_enabled,
+        file_digests=file_digests,
     )
     format_and_output(results, warnings, full_scan)
 
@@ -0,0 +1,254 @@
+import importlib.util
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+
+def _load_check_style_module():
+    root = Path(__file__).resolve().parents[1]
+    scripts_dir = root / "scripts"
+    if str(scripts_dir) not in sys.path:
+        sys.path.insert(0, str(scripts_dir))
+    module_path = scripts_dir / "check_style.py"
+    spec = importlib.util.spec_from_file_location("check_style", module_path)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_cache_store_put_writes_one_file_per_key(tmp_path):
+    check_style = _load_check_style_module()
+    cache_dir = tmp_path / "cache"
+    key_a = "ab" + "0" * 62
+    key_b = "cd" + "1" * 62
+
+    cache = check_style.CacheStore(path=cache_dir)
+    cache.put(key_a, "value-a")
+    cache.put(key_b, "value-b")
+    cache.flush()
+
+    assert (cache_dir / "ab" / f"{key_a}.json").is_file()
+    assert (cache_dir / "cd" / f"{key_b}.json").is_file()
+
+    reloaded = check_style.CacheStore(path=cache_dir)
+    assert reloaded.get(key_a) == "value-a"
+    assert reloaded.get(key_b) == "value-b"
+    assert reloaded.get("ef" + "2" * 62) is None
+
+
+def test_cache_store_drops_expired_entry_file(tmp_path):
+    check_style = _load_check_style_module()
+    cache_dir = tmp_path / "cache"
+    key = "ab" + "0" * 62
+
+    cache = check_style.CacheStore(path=cache_dir, ttl_seconds=1)
+    cache.put(key, "value")
+    cache._current_ts = lambda: 10**12
+
+    assert cache.get(key) is None
+    cache.flush()
+    assert not (cache_dir / "ab" / f"{key}.json").exists()
+
+
+def test_cache_store_ttl_counts_from_last_access_in_memory_and_on_disk(tmp_path):
+    check_style = _load_check_style_module()
+    cache_dir = tmp_path / "cache"
+    key = "ab" + "0" * 62
+    entry_path = cache_dir / "ab" / f"{key}.json"
+    clock = [1_000_000.0]
+
+    cache = check_style.CacheStore(path=cache_dir, ttl_seconds=100)
+    cache._current_ts = lambda: clock[0]
+    cache.put(key, "value")
+    cache.flush()
+    clock[0] += 80
+    assert cache.get(key) == "value"
+    clock[0] += 70
+
+    assert cache.get(key) == "value"
+    assert entry_path.stat().st_mtime == clock[0]
+    pruner = check_style.CacheStore(path=cache_dir, ttl_seconds=100)
+    pruner._current_ts = lambda: clock[0] + 99
+    assert pruner.prune() == 0
+    pruner._current_ts = lambda: clock[0] + 100
+    assert pruner.prune() == 1
+    clock[0] += 100
+    assert cache.get(key) is None
+
+
+def test_cache_store_load_migrates_legacy_single_file(tmp_path):
+    check_style = _load_check_style_module()
+    legacy_path = tmp_path / "cache.json"
+    live_key = "ab" + "0" * 62
+    expired_key = "cd" + "1" * 62
+    legacy_path.write_text(
+        json.dumps({live_key: "legacy", expired_key: {"value": "old", "expires_at": 0}}),
+        encoding="utf-8",
+    )
+
+    cache = check_style.CacheStore(path=tmp_path / "cache")
+    cache.load()
+
+    assert not legacy_path.exists()
+    assert cache.get(live_key) == "legacy"
+    assert cache.get(expired_key) is None
+
+
+def test_file_digest_cache_reuses_digest_while_stamp_matches(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    old_ns = time.time_ns() - 60 * 1_000_000_000
+    data = b"print('a')\n"
+
+    digest_cache = check_style.FileDigestCache(path=tmp_path / "file-digests.json")
+    digest = digest_cache.digest_for("a.py", old_ns, len(data), data)
+    assert digest == check_style._git_blob_id(data)
+    digest_cache.save()
+
+    reloaded = check_style.FileDigestCache(path=tmp_path / "file-digests.json")
+    reloaded.load()
+    monkeypatch.setattr(check_style, "_git_blob_id", lambda data: "recomputed")
+    assert reloaded.digest_for("a.py", old_ns, len(data), data) == digest
+    assert reloaded.digest_for("a.py", old_ns + 1, len(data), b"print('b')\n") == "recomputed"
+
+
+def test_load_file_contents_hashes_the_bytes_it_read(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    monkeypatch.chdir(tmp_path)
+    paths = [f"f{i}.py" for i in range(50)]
+    for i, path in enumerate(paths):
+        (tmp_path / path).write_bytes(f"x = {i}\r\n".encode("utf-8"))
+    digest_cache = check_style.FileDigestCache(path=tmp_path / "file-digests.json")
+    digests: dict[str, str] = {}
+
+    contents = check_style.load_file_contents(
+        [*paths, "missing.py"], staged=False, full_scan=True, digests=digests, digest_cache=digest_cache,
+    )
+
+    assert list(digests) == paths
+    assert contents["f7.py"] == "x = 7\n"
+    assert digests["f7.py"] == check_style._git_blob_id(b"x = 7\r\n")
+
+
+def test_multi_get_returns_values_in_key_order(tmp_path):
+    check_style = _load_check_style_module()
+    cache = check_style.CacheStore(path=tmp_path / "cache")
+    cache.put("aa11", "first")
+    cache.put("bb22", "second")
+    cache.flush()
+
+    reloaded = check_style.CacheStore(path=tmp_path / "cache")
+    assert reloaded.multi_get(["bb22", "missing", "aa11"]) == ["second", None, "first"]
+
+
+def test_unit_cache_key_ignores_diff_index_line():
+    check_style = _load_check_style_module()
+    hunk = "--- a/app.py\n+++ b/app.py\n@@ -1 +1 @@\n-x = 1\n+x = 2\n"
+    before = "diff --git a/app.py b/app.py\nindex 1111111..2222222 100644\n" + hunk
+    after_rebase = "diff --git a/app.py b/app.py\nindex 3333333..4444444 100644\n" + hunk
+
+    def key(diff):
+        return check_style.resolve_unit_cache_key("rule.md", "body", "app.py", "x = 2\n", diff, "")[0]
+
+    assert key(before) == key(after_rebase)
+    assert key(before) != key(before.replace("+x = 2", "+x = 3"))
+
+
+def test_unit_cache_key_includes_context_sent_with_the_diff():
+    check_style = _load_check_style_module()
+    hunk = "--- a/app.py\n+++ b/app.py\n@@ -1 +1 @@\n-x = 1\n+x = 2\n"
+    diff = "diff --git a/app.py b/app.py\nindex 1111111..2222222 100644\n" + hunk
+
+    def key(content, digest=""):
+        return check_style.resolve_unit_cache_key(
+            "rule.md", "body", "app.py", content, diff, "", content_digest=digest,
+        )[0]
+
+    assert key("x = 2\nimport os\n") != key("x = 2\nimport sys\n")
+    assert key("x = 2\n", digest="aaa") != key("x = 2\n", digest="bbb")
+    large = "x = 2\n" + "".join(f"line {index}\n" for index in range(1000))
+    assert key(large) == key(large.replace("line 999", "line changed"))
+    assert key(large) != key(large.replace("line 3\n", "line changed\n"))
+
+
+def test_cache_store_writer_keeps_last_request_per_key(tmp_path):
+    check_style = _load_check_style_module()
+    cache_dir = tmp_path / "cache"
+    key = "ab" + "0" * 62
+
+    cache = check_style.CacheStore(path=cache_dir)
+    for index in range(50):
+        cache.put(key, f"value-{index}")
+    cache.flush()
+
+    assert check_style.CacheStore(path=cache_dir).get(key) == "value-49"
+    assert list((cache_dir / "ab").iterdir()) == [cache_dir / "ab" / f"{key}.json"]
+
+
+def test_cache_store_writer_survives_unexpected_errors(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    cache_dir = tmp_path / "cache"
+    bad_key = "aa" + "0" * 62
+    good_key = "bb" + "0" * 62
+    cache = check_style.CacheStore(path=cache_dir)
+    original_write_entry = cache._write_entry
+
+    def write_entry(key, entry, shard_dirs=None):
+        if key == bad_key:
+            raise TypeError("unserializable")
+        original_write_entry(key, entry, shard_dirs)
+
+    monkeypatch.setattr(cache, "_write_entry", write_entry)
+    cache.put(bad_key, "bad")
+    cache.flush()
+    cache.put(good_key, "good")
+    cache.flush()
+
+    assert cache._writer.is_alive()
+    assert check_style.CacheStore(path=cache_dir).get(good_key) == "good"
+    assert check_style.CacheStore(path=cache_dir).get(bad_key) is None
+
+
+def test_cache_store_prune_drops_least_recently_read_entries(tmp_path):
+    check_style = _load_check_style_module()
+    cache_dir = tmp_path / "cache"
+    keys = [f"{index:02d}" + "0" * 62 for index in range(4)]
+
+    cache = check_style.CacheStore(path=cache_dir, max_entries=2)
+    for key in keys:
+        cache.put(key, key)
+    cache.flush()
+    now = time.time()
+    for age, key in enumerate(reversed(keys)):
+        path = cache_dir / key[:2] / f"{key}.json"
+        os.utime(path, (now - 100 * (age + 1), now - 100 * (age + 1)))
+
+    assert check_style.CacheStore(path=cache_dir, max_entries=2).get(keys[0]) == keys[0]
+    removed = check_style.CacheStore(path=cache_dir, max_entries=2).prune()
+
+    remaining = sorted(path.stem for path in cache_dir.glob("*/*.json"))
+    assert removed == 2
+    assert remaining == sorted([keys[0], keys[3]])
+
+
+def test_rule_scoped_suppressions_only_change_that_rules_cache_key():
+    check_style = _load_check_style_module()
+    shared = "# Suppressions\n\n- 共通の例外"
+    before = shared + "\n\n## rule: a.md\n- a の例外\n\n## その他\n- 追記"
+    after = shared + "\n\n## rule: a.md\n- a の例外 (更新)\n\n## その他\n- 追記"
+
+    assert check_style.suppressions_for_rule(before, "b.md") == shared + "\n\n## その他\n- 追記"
+    assert check_style.suppressions_for_rule(before, "a.md") == before
+    assert check_style.suppressions_for_rule(shared, "a.md") == shared
+
+    def key(suppressions, rule_name):
+        return check_style.resolve_unit_cache_key(
+            rule_name, "body", "x.py", "content", "diff",
+            check_style.suppressions_for_rule(suppressions, rule_name),
+        )[0]
+
+    assert key(before, "b.md") == key(after, "b.md")
+    assert key(before, "a.md") != key(after, "a.md")
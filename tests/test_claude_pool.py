@@ -0,0 +1,105 @@
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+
+def _load_check_style_module():
+    root = Path(__file__).resolve().parents[1]
+    scripts_dir = root / "scripts"
+    if str(scripts_dir) not in sys.path:
+        sys.path.insert(0, str(scripts_dir))
+    module_path = scripts_dir / "check_style.py"
+    spec = importlib.util.spec_from_file_location("check_style", module_path)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _install_fake_claude(bin_dir: Path, script: str, monkeypatch) -> None:
+    bin_dir.mkdir()
+    fake = bin_dir / "claude"
+    fake.write_text("#!/bin/sh\n" + script, encoding="utf-8")
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+
+def test_claude_pool_round_trips_utf8_prompt_and_response(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    _install_fake_claude(tmp_path / "bin", "cat\nprintf '\\n\\377'\n", monkeypatch)
+    pool = check_style.ClaudePool(size=1)
+
+    try:
+        response = pool.submit("違反はありません。", "model")
+    finally:
+        pool.close()
+
+    assert response == "違反はありません。\n�"
+
+
+def test_claude_pool_reports_decoded_stderr_on_failure(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    _install_fake_claude(tmp_path / "bin", "cat >/dev/null\necho 'エラー' >&2\nexit 3\n", monkeypatch)
+    pool = check_style.ClaudePool(size=1)
+
+    try:
+        response = pool.submit("prompt", "model")
+    finally:
+        pool.close()
+
+    assert response == "[Validator error] claude exited with code 3: エラー"
+
+
+def test_claude_pool_builds_child_env_once_without_claudecode(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    _install_fake_claude(tmp_path / "bin", "cat >/dev/null\necho \"[${CLAUDECODE:-unset}]\"\n", monkeypatch)
+    monkeypatch.setenv("CLAUDECODE", "1")
+    pool = check_style.ClaudePool(size=1)
+
+    try:
+        first = pool.submit("a", "model")
+        env = pool._env
+        second = pool.submit("b", "model")
+    finally:
+        pool.close()
+
+    assert first == second == "[unset]"
+    assert pool._env is env
+    assert "CLAUDECODE" not in env
+
+
+def test_claude_pool_prespawns_only_while_units_remain_queued(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    _install_fake_claude(tmp_path / "bin", "cat\n", monkeypatch)
+    pool = check_style.ClaudePool(size=2)
+
+    try:
+        pool.submit("last", "model")
+        idle_after_last = pool._idle_count_locked()
+        pool.set_queued(1)
+        pool.submit("more", "model")
+        idle_with_queued = pool._idle_count_locked()
+        pool.submit("more", "other-model")
+        idle_when_covered = pool._idle_count_locked()
+    finally:
+        pool.close()
+
+    assert idle_after_last == 0
+    assert idle_with_queued == 1
+    assert idle_when_covered == 1
+
+
+def test_iter_unit_results_reports_undispatched_units_to_the_pool(monkeypatch):
+    check_style = _load_check_style_module()
+    reported = []
+    monkeypatch.setattr(check_style.CLAUDE_POOL, "set_queued", reported.append)
+    units = [("rule.md", "body", f"f{index}.py") for index in range(3)]
+
+    results = list(
+        check_style.iter_unit_results(units, lambda unit: unit[2], 1, check_style.time.monotonic_ns() + 10**10)
+    )
+
+    assert [result for _unit, result in results] == ["f0.py", "f1.py", "f2.py"]
+    assert reported == [3, 2, 1, 0, 0]
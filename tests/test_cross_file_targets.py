@@ -1,4 +1,5 @@
 import importlib.util
+import subprocess
 import sys
 from pathlib import Path
 
@@ -85,6 +86,64 @@ def test_rule_target_pool_expands_only_for_cross_file_rules():
     assert sorted(direct_scope_pool) == ["helper.py", "main.py"]
 
 
+def test_enumerate_rule_units_uses_cross_file_pool_per_rule():
+    check_style = _load_check_style_module()
+    rules = [
+        ("plain.md", ["*.py"], "plain body", {}),
+        ("cross.md", ["*.py"], "cross body", {"cross_file": True, "dependency_scope": "python_imports"}),
+        ("docs.md", ["*.md"], "docs body", {}),
+    ]
+    files = {"helper.py": "", "main.py": "", "README.md": ""}
+
+    units = check_style.enumerate_rule_units(
+        rules,
+        target_files=["helper.py", "README.md", "unreadable.py"],
+        files=files,
+        cross_file_targets={"helper.py", "main.py"},
+    )
+
+    assert units == [
+        ("plain.md", "plain body", "helper.py"),
+        ("cross.md", "cross body", "helper.py"),
+        ("cross.md", "cross body", "main.py"),
+        ("docs.md", "docs body", "README.md"),
+    ]
+
+
+def test_select_rule_target_files_adds_cross_file_targets_only_for_cross_file_rules(monkeypatch):
+    check_style = _load_check_style_module()
+    rules = [
+        ("plain.md", ["*.md"], "plain body", {}),
+        ("cross.md", ["*.py"], "cross body", {"cross_file": True}),
+    ]
+
+    matched = check_style.select_rule_target_files(
+        rules,
+        target_files=["main.py", "README.md", "setup.cfg"],
+        cross_file_targets={"main.py", "util.py", "CHANGES.md"},
+    )
+
+    assert matched == ["main.py", "README.md", "util.py"]
+
+    first_pass = check_style.select_rule_target_files(rules, ["main.py", "README.md", "setup.cfg"])
+    scanned = []
+    original_files_matching_patterns = check_style.files_matching_patterns
+    monkeypatch.setattr(
+        check_style,
+        "files_matching_patterns",
+        lambda patterns, file_paths: (
+            scanned.append(list(file_paths)) or original_files_matching_patterns(patterns, file_paths)
+        ),
+    )
+    assert check_style.select_rule_target_files(
+        rules,
+        target_files=["main.py", "README.md", "setup.cfg"],
+        cross_file_targets={"main.py", "util.py", "CHANGES.md"},
+        matched_files=first_pass,
+    ) == matched
+    assert scanned == [["CHANGES.md", "util.py"]]
+
+
 def test_resolve_cross_file_targets_supports_python_imports_direct(monkeypatch):
     check_style = _load_check_style_module()
     rules = [
@@ -104,7 +163,11 @@ def test_resolve_cross_file_targets_supports_python_imports_direct(monkeypatch):
     }
 
     monkeypatch.setattr(check_style, "get_all_tracked_files", lambda: tracked)
-    monkeypatch.setattr(check_style, "run_git", lambda *args: blob_by_path.get(args[1], ""))
+    monkeypatch.setattr(
+        check_style.GIT_CAT_FILE,
+        "read_blobs",
+        lambda names: [blob_by_path[name].encode("utf-8") if name in blob_by_path else None for name in names],
+    )
 
     expanded = check_style.resolve_cross_file_targets(
         rules,
@@ -141,3 +204,23 @@ def test_load_rules_from_dir_keeps_cross_file_options(tmp_path):
     assert "Rule body" in body
     assert options["cross_file"] is True
     assert options["dependency_scope"] == "python_imports"
+
+
+def test_staged_cross_file_targets_skip_undecodable_files(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    (tmp_path / "helper.py").write_text("def helper():\n    pass\n", encoding="utf-8")
+    (tmp_path / "main.py").write_text("import helper\n", encoding="utf-8")
+    (tmp_path / "legacy.py").write_bytes(b"# caf\xe9\nimport helper\n")
+    subprocess.run(["git", "add", "."], cwd=tmp_path, check=True)
+    monkeypatch.chdir(tmp_path)
+    rules = [("cross", ["*.py"], "body", {"cross_file": True})]
+
+    try:
+        targets = check_style.resolve_cross_file_targets(
+            rules=rules, target_files=["helper.py"], staged=True, full_scan=False,
+        )
+    finally:
+        check_style.GIT_CAT_FILE.close()
+
+    assert targets == {"helper.py", "main.py"}
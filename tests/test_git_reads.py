@@ -0,0 +1,327 @@
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+
+def _load_check_style_module():
+    root = Path(__file__).resolve().parents[1]
+    scripts_dir = root / "scripts"
+    if str(scripts_dir) not in sys.path:
+        sys.path.insert(0, str(scripts_dir))
+    module_path = scripts_dir / "check_style.py"
+    spec = importlib.util.spec_from_file_location("check_style", module_path)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def test_staged_reads_share_one_cat_file_process(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "a.py").write_text("staged a\n", encoding="utf-8")
+    (tmp_path / "b.py").write_text("staged b\n", encoding="utf-8")
+    _git(tmp_path, "add", "a.py", "b.py")
+    (tmp_path / "a.py").write_text("working a\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    try:
+        assert check_style.get_file_content("a.py", staged=True) == "staged a"
+        process = check_style.GIT_CAT_FILE._process
+        assert check_style.get_file_content("b.py", staged=True) == "staged b"
+        assert check_style.get_file_content("missing.py", staged=True) == ""
+        assert check_style.GIT_CAT_FILE._process is process
+        assert check_style.get_file_content("a.py", staged=False) == "working a\n"
+    finally:
+        check_style.GIT_CAT_FILE.close()
+
+
+def test_read_blobs_skips_missing_names_containing_spaces(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "present.py").write_text("present\n", encoding="utf-8")
+    _git(tmp_path, "add", "present.py")
+    monkeypatch.chdir(tmp_path)
+
+    try:
+        blobs = check_style.GIT_CAT_FILE.read_blobs([":a b.py", ":present.py", ":c d e.py", ":present.py"])
+    finally:
+        check_style.GIT_CAT_FILE.close()
+
+    assert blobs == [None, b"present\n", None, b"present\n"]
+
+
+def test_load_file_contents_reads_staged_files_in_one_batch(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    _git(tmp_path, "init", "-q")
+    names = [f"module_{i:04d}_{'x' * 40}.py" for i in range(1500)]
+    for name in names:
+        (tmp_path / name).write_text(f"# {name}\n", encoding="utf-8")
+    (tmp_path / "empty.py").write_text("\n", encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    monkeypatch.chdir(tmp_path)
+
+    try:
+        contents = check_style.load_file_contents(
+            names + ["empty.py", "missing.py"], staged=True, full_scan=False,
+        )
+    finally:
+        check_style.GIT_CAT_FILE.close()
+
+    assert list(contents) == names
+    assert contents[names[-1]] == f"# {names[-1]}"
+
+
+def test_load_file_contents_normalizes_crlf_in_staged_blobs(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "core.autocrlf", "false")
+    (tmp_path / "a.py").write_bytes(b"x = 1\r\ny = 2\r\n")
+    _git(tmp_path, "add", "a.py")
+    monkeypatch.chdir(tmp_path)
+
+    try:
+        staged = check_style.load_file_contents(["a.py"], staged=True, full_scan=False)
+        single = check_style.get_file_content("a.py", staged=True)
+    finally:
+        check_style.GIT_CAT_FILE.close()
+    working = check_style.load_file_contents(["a.py"], staged=False, full_scan=False)
+
+    assert staged == {"a.py": "x = 1\ny = 2"}
+    assert single == "x = 1\ny = 2"
+    assert working["a.py"].strip() == staged["a.py"]
+
+
+def test_load_file_contents_skips_binary_working_files(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    (tmp_path / "a.py").write_bytes(b"x = 1\r\ny = 2\r\n")
+    (tmp_path / "data.bin").write_bytes(b"text" + b"\0" * 10 + b"more")
+    (tmp_path / "logo.PNG").write_text("not really an image\n", encoding="utf-8")
+    (tmp_path / "latin1.txt").write_bytes(b"caf\xe9\n")
+    monkeypatch.chdir(tmp_path)
+
+    contents = check_style.load_file_contents(
+        ["a.py", "data.bin", "logo.PNG", "latin1.txt", "missing.py"], staged=False, full_scan=True,
+    )
+
+    assert contents == {"a.py": "x = 1\ny = 2\n"}
+
+
+def test_diff_snapshot_matches_name_only_without_deletions(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "dev@example.com")
+    _git(tmp_path, "config", "user.name", "dev")
+    for name in ("kept.py", "removed.py"):
+        (tmp_path / name).write_text(f"{name}\n", encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    (tmp_path / "kept.py").write_text("changed\n", encoding="utf-8")
+    (tmp_path / "added.py").write_text("new\n", encoding="utf-8")
+    _git(tmp_path, "rm", "-q", "removed.py")
+    _git(tmp_path, "add", ".")
+    monkeypatch.chdir(tmp_path)
+
+    snapshot = check_style.DiffSnapshot.capture(staged=True)
+
+    assert snapshot.changed_files == ["added.py", "kept.py"]
+    assert set(snapshot.diff_chunks) == {"added.py", "kept.py", "removed.py"}
+    assert "+changed" in snapshot.diff_chunks["kept.py"]
+
+
+def test_diff_snapshot_ignores_user_diff_config(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "foo.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b" / "bar.py").write_text("y = 1\n", encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    monkeypatch.chdir(tmp_path)
+    settings = [
+        ("color.ui", "always"),
+        ("diff.mnemonicPrefix", "true"),
+        ("diff.noprefix", "true"),
+        ("diff.external", "false"),
+    ]
+    monkeypatch.setenv("GIT_CONFIG_COUNT", str(len(settings)))
+    for index, (key, value) in enumerate(settings):
+        monkeypatch.setenv(f"GIT_CONFIG_KEY_{index}", key)
+        monkeypatch.setenv(f"GIT_CONFIG_VALUE_{index}", value)
+
+    snapshot = check_style.DiffSnapshot.capture(staged=True)
+
+    assert snapshot.changed_files == ["b/bar.py", "foo.py"]
+    assert "\x1b[" not in snapshot.diff_chunks["foo.py"]
+
+
+def test_diff_snapshot_limits_diff_to_rule_pathspecs_from_subdirectory(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "pkg").mkdir()
+    for name in ("top.py", "pkg/mod.py", "pkg/Makefile", "pkg/notes.txt", "README.md"):
+        (tmp_path / name).write_text(f"{name}\n", encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    monkeypatch.chdir(tmp_path / "pkg")
+    rules = [
+        ("py.md", ["*.py", "Makefile"], "body", {}),
+        ("docs.md", ["*.md"], "body", {}),
+    ]
+
+    pathspecs = check_style.rule_diff_pathspecs(rules)
+    snapshot = check_style.DiffSnapshot.capture(staged=True, pathspecs=pathspecs)
+
+    assert snapshot.changed_files == ["README.md", "pkg/Makefile", "pkg/mod.py", "top.py"]
+    assert check_style.rule_diff_pathspecs([("r.md", ["*.[ch]"], "body", {})]) is None
+    assert check_style.rule_diff_pathspecs([]) is None
+    assert check_style.rule_diff_pathspecs([("r.md", ["*_test.py"], "body", {"cross_file": True})]) == [
+        ":(top,glob)**/*.py",
+        ":(top,glob)**/*_test.py",
+    ]
+
+
+def test_rule_diff_pathspecs_fold_case_where_matching_does(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "Foo.PY").write_text("x = 1\n", encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(check_style, "_NORMCASE_FOLDS_CASE", True)
+
+    pathspecs = check_style.rule_diff_pathspecs([("py.md", ["*.py"], "body", {})])
+    snapshot = check_style.DiffSnapshot.capture(staged=True, pathspecs=pathspecs)
+
+    assert pathspecs == [":(top,glob,icase)**/*.py"]
+    assert snapshot.changed_files == ["Foo.PY"]
+
+
+def test_split_diff_by_file_keeps_section_text_and_drops_preamble():
+    check_style = _load_check_style_module()
+    diff = (
+        "preamble\n"
+        "diff --git a/a.py b/a.py\n@@ -1 +1 @@\n-x\n+y\n"
+        "diff --git a/b.py b/b.py\n@@ -1 +1 @@\n-1\n+2"
+    )
+
+    chunks = check_style.split_diff_by_file(diff)
+
+    assert chunks == {
+        "a.py": "diff --git a/a.py b/a.py\n@@ -1 +1 @@\n-x\n+y\n",
+        "b.py": "diff --git a/b.py b/b.py\n@@ -1 +1 @@\n-1\n+2",
+    }
+
+
+def test_split_diff_by_file_keys_paths_containing_b_slash_and_quoted_paths():
+    check_style = _load_check_style_module()
+    diff = (
+        b"diff --git a/x b/y.py b/x b/y.py\nold mode 100644\nnew mode 100755\n"
+        b"diff --git a/x b/z.py b/x b/z.py\nindex 1..2 100644\n--- a/x b/z.py\t\n+++ b/x b/z.py\t\n@@ -1 +1 @@\n-a\n+b\n"
+        b'diff --git "a/h\\303\\251llo w.py" "b/h\\303\\251llo w.py"\nindex 1..2 100644\n'
+        b'--- "a/h\\303\\251llo w.py"\t\n+++ "b/h\\303\\251llo w.py"\t\n@@ -1 +1 @@\n-a\n+b\n'
+        b'diff --git "a/t\\tq\\"t.bin" "b/t\\tq\\"t.bin"\nBinary files differ\n'
+        b"diff --git a/old.py b/new name.py\nsimilarity index 100%\nrename from old.py\nrename to new name.py\n"
+        b"diff --git a/gone.py b/gone.py\ndeleted file mode 100644\n--- a/gone.py\n+++ /dev/null\n@@ -1 +0,0 @@\n-a"
+    )
+
+    chunks = check_style.split_diff_by_file(diff)
+
+    assert list(chunks) == ["x b/y.py", "x b/z.py", "h\u00e9llo w.py", 't\tq"t.bin', "new name.py", "gone.py"]
+    assert list(check_style.split_diff_by_file(diff.decode("utf-8"))) == list(chunks)
+
+
+def test_diff_snapshot_lists_quoted_and_b_slash_paths(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "x b").mkdir()
+    names = ["x b/y.py", "h\u00e9llo w\u00f6rld.py"]
+    for name in names:
+        (tmp_path / name).write_text("a\n", encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    monkeypatch.chdir(tmp_path)
+
+    snapshot = check_style.DiffSnapshot.capture(staged=True)
+
+    assert sorted(snapshot.changed_files) == sorted(names)
+    assert "+a" in snapshot.diff_chunks["x b/y.py"]
+
+
+def test_build_diff_context_merges_hunk_windows_for_large_files():
+    check_style = _load_check_style_module()
+    content = "\n".join(f"line {number}" for number in range(1, 1001))
+    diff = (
+        "diff --git a/big.py b/big.py\n--- a/big.py\n+++ b/big.py\n"
+        "@@ -100,3 +100,4 @@\n ctx\n+new\n"
+        "@@ -130,0 +131,2 @@\n+a\n+b\n"
+        "@@ -900 +901 @@\n-x\n+y\n"
+    )
+
+    context = check_style.build_diff_context(content, diff, window=50)
+
+    assert [line for line in context.splitlines() if line.startswith("--- lines")] == [
+        "--- lines 50-182 ---",
+        "--- lines 851-951 ---",
+    ]
+    assert "line 49\n" not in context and "line 50\n" in context
+    assert check_style.build_diff_context("\n".join(content.splitlines()[:300]), diff) is None
+    assert check_style.build_diff_context(content, "") is None
+    assert check_style.build_diff_context(content, diff, window=50) is context
+
+
+def test_staged_diff_context_keeps_leading_blank_lines_aligned(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "dev@example.com")
+    _git(tmp_path, "config", "user.name", "dev")
+    lines = ["", "", ""] + [f"line {number}" for number in range(4, 1001)]
+    (tmp_path / "big.py").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    lines[599] = "changed 600"
+    (tmp_path / "big.py").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    monkeypatch.chdir(tmp_path)
+
+    snapshot = check_style.DiffSnapshot.capture(staged=True)
+    try:
+        contents = check_style.load_file_contents(["big.py"], staged=True, full_scan=False)
+        assert check_style.get_file_content("big.py", staged=True) == contents["big.py"]
+    finally:
+        check_style.GIT_CAT_FILE.close()
+    context = check_style.build_diff_context(contents["big.py"], snapshot.diff_chunks["big.py"], window=2)
+
+    assert context == "--- lines 595-605 ---\n" + "\n".join(lines[594:605]) + "\n"
+    assert "changed 600" in context
+
+
+def test_prompts_for_one_rule_share_the_file_independent_prefix():
+    check_style = _load_check_style_module()
+    small = check_style.build_prompt_for_single_file(
+        "rule.md", "## 命名\nbody", "a.py", "x = 1\n", "diff --git a/a.py b/a.py\n+x = 1\n", "known",
+    )
+    large = check_style.build_prompt_for_single_file(
+        "rule.md", "## 命名\nbody", "b.py", "y\n" * 1000, "diff --git a/b.py b/b.py\n@@ -500 +500 @@\n+y\n", "known",
+    )
+
+    prefix = small[:small.index("The diff is the primary check target.")]
+    assert large.startswith(prefix)
+    assert "=== KNOWN SUPPRESSIONS ===\n" in prefix and "- [ ] 命名\n" in prefix
+    assert "Excerpts of the file around the changes" in large[len(prefix):]
+
+
+def test_split_diff_by_file_keeps_bytes_chunks_until_accessed():
+    check_style = _load_check_style_module()
+    diff = "diff --git a/a.py b/a.py\n@@ -1 +1 @@\n-x\n+ÿ\n".encode("utf-8") + b"diff --git a/b.py b/b.py\n+\xff"
+
+    raw_chunks = check_style.split_diff_by_file(diff)
+    chunks = check_style.DiffChunks(raw_chunks)
+
+    assert raw_chunks["b.py"] == b"diff --git a/b.py b/b.py\n+\xff"
+    assert list(chunks) == ["a.py", "b.py"]
+    assert chunks["a.py"].endswith("+ÿ\n")
+    assert chunks.get("b.py") == "diff --git a/b.py b/b.py\n+�"
+    assert chunks.raw("b.py") is raw_chunks["b.py"]
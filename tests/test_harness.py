@@ -631,21 +631,17 @@ def _wait_stream_complete(
             if data.get("status") == "completed":
                 return status_path
         time.sleep(0.2)
-    _terminate_stream_worker(stream_id)
+    _terminate_stream_worker(repo_dir, stream_id)
     raise TimeoutError(f"stream {stream_id} did not finish in {timeout_seconds}s")
 
 
-def _terminate_stream_worker(stream_id: str) -> None:
-    pattern = f"--stream-worker --stream-id {stream_id}"
-    find_proc = subprocess.run(
-        ["pgrep", "-f", "--", pattern],
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    if find_proc.returncode != 0:
+def _terminate_stream_worker(repo_dir: Path, stream_id: str) -> None:
+    pid_path = repo_dir / ".complete-validator" / "stream-results" / stream_id / "worker.pid"
+    try:
+        pids = pid_path.read_text(encoding="utf-8").split()
+    except OSError:
         return
-    for line in find_proc.stdout.splitlines():
+    for line in pids:
         pid = line.strip()
         if not pid.isdigit():
             continue
@@ -35,6 +35,17 @@ def test_load_rule_config_fallback_when_broken_json(monkeypatch, tmp_path):
     assert loaded == {"version": 1, "rules": {}, "decision_log": []}
 
 
+def test_config_loaders_fall_back_on_invalid_utf8(monkeypatch, tmp_path):
+    check_style = _load_check_style_module()
+    broken_path = tmp_path / "latin1.json"
+    broken_path.write_bytes(b'{"max_workers": "\xff"}')
+    monkeypatch.setenv("RULE_VALIDATOR_RULE_CONFIG_PATH", str(broken_path))
+    monkeypatch.setenv("RULE_VALIDATOR_CONFIG_PATH", str(broken_path))
+
+    assert check_style.load_rule_config(tmp_path) == {"version": 1, "rules": {}, "decision_log": []}
+    assert check_style.load_config(tmp_path) == {}
+
+
 def test_save_rule_config_normalizes_and_roundtrips(monkeypatch, tmp_path):
     check_style = _load_check_style_module()
     target_path = tmp_path / "rule-config.json"
@@ -0,0 +1,176 @@
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+
+
+def _load_check_style_module():
+    root = Path(__file__).resolve().parents[1]
+    scripts_dir = root / "scripts"
+    if str(scripts_dir) not in sys.path:
+        sys.path.insert(0, str(scripts_dir))
+    module_path = scripts_dir / "check_style.py"
+    spec = importlib.util.spec_from_file_location("check_style", module_path)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_files_matching_patterns_matches_basename_against_any_glob():
+    check_style = _load_check_style_module()
+    file_paths = ["src/app.py", "docs/readme.md", "src/app.pyc", "Makefile"]
+
+    matched = check_style.files_matching_patterns(["*.py", "*.md"], file_paths)
+
+    assert matched == ["src/app.py", "docs/readme.md"]
+    assert check_style.files_matching_patterns([], file_paths) == []
+
+
+def test_files_matching_patterns_agrees_with_fnmatch_for_suffix_literal_and_glob_patterns():
+    import fnmatch
+
+    check_style = _load_check_style_module()
+    patterns = ["*_test.go", "Makefile", "*.[ch]", "test_?.md", ".*rc"]
+    file_paths = [
+        "pkg/x_test.go", "pkg/x.go", "Makefile", "sub/makefile", "lib/f.c", "lib/f.h",
+        "test_1.md", "test_12.md", ".bashrc", "bashrc",
+    ]
+
+    matched = check_style.files_matching_patterns(patterns, file_paths)
+
+    assert matched == [
+        path for path in file_paths
+        if any(fnmatch.fnmatchcase(path.rsplit("/", 1)[-1], pat) for pat in patterns)
+    ]
+    assert matched == ["pkg/x_test.go", "Makefile", "lib/f.c", "lib/f.h", "test_1.md", ".bashrc"]
+
+
+def test_files_matching_patterns_folds_case_like_fnmatch_on_windows(monkeypatch):
+    import ntpath
+
+    check_style = _load_check_style_module()
+    monkeypatch.setattr(check_style.os.path, "normcase", ntpath.normcase)
+    monkeypatch.setattr(check_style, "_NORMCASE_FOLDS_CASE", True)
+    patterns = ["*.py", "Makefile", "test_?.MD"]
+    file_paths = ["src/Foo.PY", "MAKEFILE", "docs/Test_1.md", "notes.txt"]
+
+    matched = check_style.files_matching_patterns(patterns, file_paths)
+
+    assert matched == ["src/Foo.PY", "MAKEFILE", "docs/Test_1.md"]
+
+
+def test_any_file_matches_rules_uses_patterns_across_rules():
+    check_style = _load_check_style_module()
+    rules = [
+        ("python.md", ["*.py"], "body", {}),
+        ("text.md", ["*.txt", "README*"], "body", {}),
+    ]
+
+    assert check_style.any_file_matches_rules(rules, ["docs/README.rst"]) is True
+    assert check_style.any_file_matches_rules(rules, ["main.go", "lib.rs"]) is False
+    assert check_style.any_file_matches_rules([], ["main.py"]) is False
+
+
+def test_load_rules_from_dir_walks_subdirectories_in_path_order(tmp_path):
+    check_style = _load_check_style_module()
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a-b").mkdir()
+    for relative in ("z.md", "a/x.md", "a-b/y.md"):
+        (tmp_path / relative).write_text('---\napplies_to: ["*.py"]\n---\nbody\n', encoding="utf-8")
+    (tmp_path / "a" / "notes.txt").write_text("ignored", encoding="utf-8")
+    (tmp_path / "a" / "no_frontmatter.md").write_text("body\n", encoding="utf-8")
+
+    rules, warnings = check_style.load_rules_from_dir(tmp_path)
+
+    assert [name for name, _patterns, _body, _options in rules] == ["a/x.md", "a-b/y.md", "z.md"]
+    assert len(warnings) == 1 and "no_frontmatter.md" in warnings[0]
+
+
+def test_load_rules_from_dir_normalizes_crlf_rule_files(tmp_path):
+    check_style = _load_check_style_module()
+    (tmp_path / "crlf.md").write_bytes(b'---\r\napplies_to: ["*.py"]\r\n---\r\n# Rule\r\n## Heading\r\nbody\r\n')
+
+    rules, warnings = check_style.load_rules_from_dir(tmp_path)
+
+    assert warnings == []
+    assert rules[0][2] == "# Rule\n## Heading\nbody\n"
+
+
+def test_load_rules_cached_reuses_cache_until_rule_file_changes(tmp_path):
+    check_style = _load_check_style_module()
+    rules_dir = tmp_path / "rules"
+    rules_dir.mkdir()
+    rule_path = rules_dir / "style.md"
+    rule_path.write_text('---\napplies_to: ["*.py"]\nkeywords: ["print"]\n---\nbody\n', encoding="utf-8")
+    old_ns = time.time_ns() - 60 * 1_000_000_000
+    os.utime(rule_path, ns=(old_ns, old_ns))
+
+    first = check_style.load_rules_cached(None, [rules_dir], tmp_path)
+    assert first == check_style.merge_rules(None, [rules_dir])
+    assert (tmp_path / ".complete-validator" / "rules-cache.json").exists()
+
+    calls = []
+    original_merge_rules = check_style.merge_rules
+    check_style.merge_rules = lambda *args: calls.append(args) or original_merge_rules(*args)
+    assert check_style.load_rules_cached(None, [rules_dir], tmp_path) == first
+    assert calls == []
+
+    rule_path.write_text('---\napplies_to: ["*.md"]\n---\nnew body\n', encoding="utf-8")
+    rules, _warnings = check_style.load_rules_cached(None, [rules_dir], tmp_path)
+    assert len(calls) == 1
+    assert rules[0][1] == ["*.md"]
+
+
+def test_load_rules_cached_skips_cache_while_rule_file_is_racy(tmp_path):
+    check_style = _load_check_style_module()
+    rules_dir = tmp_path / "rules"
+    rules_dir.mkdir()
+    rule_path = rules_dir / "style.md"
+    rule_path.write_text('---\napplies_to: ["*.py"]\n---\nbody A\n', encoding="utf-8")
+    stamp = rule_path.stat().st_mtime_ns
+
+    rules, _warnings = check_style.load_rules_cached(None, [rules_dir], tmp_path)
+    assert rules[0][2] == "body A\n"
+    assert not (tmp_path / ".complete-validator" / "rules-cache.json").exists()
+
+    # 同じサイズ、同じ mtime で書き換えられても古いパース結果を返しません。
+    rule_path.write_text('---\napplies_to: ["*.py"]\n---\nbody B\n', encoding="utf-8")
+    os.utime(rule_path, ns=(stamp, stamp))
+    rules, _warnings = check_style.load_rules_cached(None, [rules_dir], tmp_path)
+    assert rules[0][2] == "body B\n"
+
+
+def test_extract_rule_headings_skips_fenced_code_blocks():
+    check_style = _load_check_style_module()
+    body = (
+        "# Title\n"
+        "## 命名規則 \n"
+        "  ```markdown\n"
+        "## not a heading\n"
+        "```\n"
+        "##no space\n"
+        " ## indented\n"
+        "~~~\n"
+        "## also skipped\n"
+        "~~~\n"
+        "## 例外処理\r\n"
+    )
+
+    assert check_style.extract_rule_headings(body) == ("命名規則", "例外処理")
+
+
+def test_find_project_rules_dirs_returns_nearest_first(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    outer = tmp_path / ".complete-validator" / "rules"
+    inner = tmp_path / "pkg" / ".complete-validator" / "rules"
+    outer.mkdir(parents=True)
+    inner.mkdir(parents=True)
+    (tmp_path / "pkg" / "sub" / ".complete-validator").mkdir(parents=True)
+    monkeypatch.chdir(tmp_path / "pkg" / "sub")
+
+    dirs = check_style.find_project_rules_dirs()
+
+    assert dirs[:2] == [inner.resolve(), outer.resolve()]
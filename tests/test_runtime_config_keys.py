@@ -84,6 +84,9 @@ def test_run_parallel_checks_batching_changes_unit_order(monkeypatch):
         def get(self, key):
             return None
 
+        def multi_get(self, keys):
+            return [None for _key in keys]
+
         def put(self, key, value):
             return None
 
@@ -128,3 +131,144 @@ def test_run_parallel_checks_batching_changes_unit_order(monkeypatch):
 
     assert without_batching != with_batching
     assert with_batching[0][1] <= with_batching[-1][1]
+
+
+def test_order_units_by_severity_runs_severe_rules_first_and_keeps_ties_stable():
+    check_style = _load_check_style_module()
+    rules = [
+        ("plain.md", ["*.py"], "plain body", {}),
+        ("low.md", ["*.py"], "low body", {"severity": "low"}),
+        ("critical.md", ["*.py"], "critical body", {"severity": "critical"}),
+    ]
+    units = [
+        ("plain.md", "plain body", "a.py"),
+        ("low.md", "low body", "a.py"),
+        ("critical.md", "critical body", "a.py"),
+        ("plain.md", "plain body", "b.py"),
+        ("critical.md", "critical body", "b.py"),
+        ("unknown.md", "unknown body", "a.py"),
+    ]
+
+    ordered = check_style.order_units_by_severity(units, rules)
+
+    assert ordered == [
+        ("critical.md", "critical body", "a.py"),
+        ("critical.md", "critical body", "b.py"),
+        ("low.md", "low body", "a.py"),
+        ("plain.md", "plain body", "a.py"),
+        ("plain.md", "plain body", "b.py"),
+        ("unknown.md", "unknown body", "a.py"),
+    ]
+
+
+def test_run_parallel_checks_batching_groups_files_within_each_severity_band(monkeypatch):
+    check_style = _load_check_style_module()
+    recorded: list[tuple[str, str]] = []
+
+    def fake_check(rule_name, rule_body, file_path, file_content, file_diff, suppressions, cache, **kwargs):
+        recorded.append((rule_name, file_path))
+        return (rule_name, file_path, "allow", "No violations found.", False)
+
+    class DummyCache:
+        def multi_get(self, keys):
+            return [None for _key in keys]
+
+    monkeypatch.setattr(check_style, "check_single_rule_single_file", fake_check)
+    rules = [
+        ("plain.md", ["*.py"], "plain body", {}),
+        ("low.md", ["*.py"], "low body", {"severity": "low"}),
+        ("critical.md", ["*.py"], "critical body", {"severity": "critical"}),
+    ]
+
+    check_style.run_parallel_checks(
+        rules=rules,
+        target_files=["b.py", "a.py"],
+        files={"a.py": "print('a')", "b.py": "print('b')"},
+        diff_chunks={"a.py": "+a", "b.py": "+b"},
+        suppressions="",
+        cache=DummyCache(),
+        full_scan=False,
+        max_workers=1,
+        model="sonnet",
+        batching_enabled=True,
+    )
+
+    # severity が優先され、1 ファイルの単位は severity ごとに分かれます。同じ severity の中ではファイル順です。
+    assert recorded == [
+        ("critical.md", "a.py"),
+        ("critical.md", "b.py"),
+        ("low.md", "a.py"),
+        ("low.md", "b.py"),
+        ("plain.md", "a.py"),
+        ("plain.md", "b.py"),
+    ]
+
+
+def test_run_parallel_checks_resolves_cached_units_without_running_them(monkeypatch):
+    check_style = _load_check_style_module()
+    recorded: list[tuple[str, str]] = []
+
+    def fake_check(rule_name, rule_body, file_path, file_content, file_diff, suppressions, cache, **kwargs):
+        recorded.append((rule_name, file_path))
+        return (rule_name, file_path, "allow", "No violations found.", False)
+
+    files = {"a.py": "print('a')", "b.py": "print('b')"}
+    diff_chunks = {"a.py": "+a", "b.py": "+b"}
+    cached_key, _use_full_content = check_style.resolve_unit_cache_key(
+        "rule.md", "body", "b.py", files["b.py"], diff_chunks["b.py"], "",
+    )
+
+    class DummyCache:
+        def get(self, key):
+            return "cached" if key == cached_key else None
+
+        def multi_get(self, keys):
+            return [self.get(key) for key in keys]
+
+        def put(self, key, value):
+            return None
+
+    monkeypatch.setattr(check_style, "check_single_rule_single_file", fake_check)
+
+    results = check_style.run_parallel_checks(
+        rules=[("rule.md", ["*.py"], "body", {})],
+        target_files=["a.py", "b.py"],
+        files=files,
+        diff_chunks=diff_chunks,
+        suppressions="",
+        cache=DummyCache(),
+        full_scan=False,
+        max_workers=1,
+        model="sonnet",
+    )
+
+    assert recorded == [("rule.md", "a.py")]
+    assert results == [("rule.md", "allow", "cached\n\nNo violations found.")]
+
+
+def test_check_single_rule_skips_claude_when_no_keyword_appears(monkeypatch):
+    check_style = _load_check_style_module()
+    calls: list[str] = []
+    monkeypatch.setattr(check_style, "run_claude_check", lambda prompt, model="sonnet": calls.append(prompt) or "No violations found.")
+
+    keywords = check_style.resolve_rule_keywords("auto", "Use `logging` instead of `print`.\n")
+    assert keywords == ("logging", "print")
+
+    class DummyCache:
+        def get(self, key):
+            return None
+
+        def put(self, key, value):
+            return None
+
+    skipped = check_style.check_single_rule_single_file(
+        "r.md", "body", "a.py", "x = 1\n", "+x = 1\n", "", DummyCache(), keywords=keywords,
+    )
+    assert skipped[2] == "allow"
+    assert calls == []
+
+    checked = check_style.check_single_rule_single_file(
+        "r.md", "body", "b.py", "print(1)\n", "+print(1)\n", "", DummyCache(), keywords=keywords,
+    )
+    assert checked[2] == "allow"
+    assert len(calls) == 1
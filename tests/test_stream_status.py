@@ -0,0 +1,217 @@
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def _load_check_style_module():
+    root = Path(__file__).resolve().parents[1]
+    scripts_dir = root / "scripts"
+    if str(scripts_dir) not in sys.path:
+        sys.path.insert(0, str(scripts_dir))
+    module_path = scripts_dir / "check_style.py"
+    spec = importlib.util.spec_from_file_location("check_style", module_path)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_tracker_appends_events_and_coalesces_status_writes(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    monkeypatch.setattr(check_style, "STATUS_FLUSH_INTERVAL_SECONDS", 3600)
+    tracker = check_style.StreamStatusTracker(results_dir=tmp_path, total_units=3)
+
+    tracker.update("allow")
+    tracker.update("deny")
+    status = json.loads((tmp_path / "status.json").read_text(encoding="utf-8"))
+    assert status["completed_units"] == 0
+    events = (tmp_path / "events.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["status"] for line in events] == ["allow", "deny"]
+
+    tracker.update("allow")
+    status = json.loads((tmp_path / "status.json").read_text(encoding="utf-8"))
+    assert status["status"] == "completed"
+    assert status["summary"] == {"allow": 2, "deny": 1, "error": 0, "pending": 0}
+    tracker.mark_completed()
+
+
+def test_tracker_update_batch_records_all_units_in_one_write(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    monkeypatch.setattr(check_style, "STATUS_FLUSH_INTERVAL_SECONDS", 3600)
+    tracker = check_style.StreamStatusTracker(results_dir=tmp_path, total_units=4)
+
+    tracker.update_batch([])
+    tracker.update_batch(["allow", "deny", "allow"])
+    assert tracker._events_file is not None
+    status = json.loads((tmp_path / "status.json").read_text(encoding="utf-8"))
+    assert status["completed_units"] == 0
+    tracker.update("error")
+
+    events = (tmp_path / "events.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["status"] for line in events] == ["allow", "deny", "allow", "error"]
+    status = json.loads((tmp_path / "status.json").read_text(encoding="utf-8"))
+    assert status["status"] == "completed"
+    assert status["summary"] == {"allow": 2, "deny": 1, "error": 1, "pending": 0}
+    tracker.mark_completed()
+
+
+def test_write_result_file_replaces_result_without_leftover_temp_files(tmp_path):
+    check_style = _load_check_style_module()
+
+    check_style.write_result_file(tmp_path, "dir/rule.md", "src/app.py", "deny", "first", False)
+    check_style.write_result_file(tmp_path, "dir/rule.md", "src/app.py", "allow", "second", True)
+
+    entries = list((tmp_path / "results").iterdir())
+    assert len(entries) == 1
+    assert entries[0].name.startswith("dir__rule__")
+    data = json.loads(entries[0].read_text(encoding="utf-8"))
+    assert data == {
+        "rule_name": "dir/rule.md",
+        "file_path": "src/app.py",
+        "status": "allow",
+        "message": "second",
+        "cache_hit": True,
+    }
+
+
+def test_list_queue_states_reuses_parsed_states_until_files_change(tmp_path):
+    check_style = _load_check_style_module()
+    queue_dir = tmp_path / "queue"
+    pending_id = "a" * 64
+    resolved_id = "b" * 64
+    pending_path = queue_dir / f"100__pending__{pending_id}.state.json"
+    check_style._write_json_atomically(pending_path, {"id": pending_id, "run_id": "s1", "message": "old"})
+    check_style._write_json_atomically(
+        queue_dir / f"100__resolved__{resolved_id}.state.json", {"id": resolved_id, "run_id": "s1"},
+    )
+    reads = []
+    original_read_json_file = check_style._read_json_file
+    check_style._read_json_file = lambda path: reads.append(path.name) or original_read_json_file(path)
+    pending_only = {check_style.ViolationStatus.PENDING}
+
+    first = check_style._list_queue_states(queue_dir, statuses=pending_only)
+    first[0][1]["message"] = "mutated"
+    second = check_style._list_queue_states(queue_dir, stream_id="s1", statuses=pending_only)
+    check_style._write_json_atomically(pending_path, {"id": pending_id, "run_id": "s1", "message": "new"})
+    third = check_style._list_queue_states(queue_dir, statuses=pending_only)
+
+    assert reads == [pending_path.name, pending_path.name]
+    assert second[0][1]["message"] == "old"
+    assert third[0][1]["message"] == "new"
+
+
+def test_write_json_atomically_skips_fsync_only_when_not_durable(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    synced = []
+    monkeypatch.setattr(check_style.os, "fsync", lambda fd: synced.append(fd))
+
+    check_style._write_json_atomically(tmp_path / "cache.json", {"a": 1}, durable=False)
+    assert synced == []
+    check_style._write_json_atomically(tmp_path / "state.json", {"b": 2})
+    assert len(synced) == 1
+
+    assert check_style._read_json_file(tmp_path / "cache.json") == {"a": 1}
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["cache.json", "state.json"]
+
+
+def test_list_queue_states_orders_by_priority_unless_unordered(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    queue_dir = tmp_path / "queue"
+    for priority, letter, severity in [(300, "a", "medium"), (100, "b", "high"), (200, "c", "low")]:
+        check_style._write_json_atomically(
+            queue_dir / f"{priority}__pending__{letter * 64}.state.json",
+            {"id": letter * 64, "severity": severity, "detected_at": "2026-01-01T00:00:00"},
+        )
+    severity_calls = []
+    original_severity_priority = check_style._severity_priority
+    monkeypatch.setattr(
+        check_style,
+        "_severity_priority",
+        lambda severity: severity_calls.append(severity) or original_severity_priority(severity),
+    )
+
+    unordered = check_style._list_queue_states(queue_dir, ordered=False)
+    assert severity_calls == []
+    ordered = check_style._list_queue_states(queue_dir)
+
+    assert [item[2] for item in ordered] == [100, 200, 300]
+    assert sorted(item[2] for item in unordered) == [100, 200, 300]
+    assert severity_calls
+
+
+def test_machine_written_json_is_compact_but_rule_config_stays_indented(tmp_path):
+    check_style = _load_check_style_module()
+
+    check_style.write_result_file(tmp_path, "rule.md", "app.py", "allow", "ok", False)
+    check_style._write_json_atomically(tmp_path / "state.json", {"id": "x", "nested": {"a": 1}})
+    config_path = check_style.save_rule_config(tmp_path, {})
+
+    result_text = next((tmp_path / "results").iterdir()).read_text(encoding="utf-8")
+    assert "\n" not in result_text
+    assert "\n" not in (tmp_path / "state.json").read_text(encoding="utf-8")
+    assert "\n  " in config_path.read_text(encoding="utf-8")
+
+
+def test_cleanup_old_stream_results_keeps_newest_dirs_and_ignores_files(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    monkeypatch.setattr(check_style, "MAX_STREAM_RESULTS_DIRS", 2)
+    for name in ["20260101-000000-aaaaaa", "20260102-000000-bbbbbb", "20260103-000000-cccccc"]:
+        (tmp_path / name).mkdir()
+    (tmp_path / "zz-note.txt").write_text("keep", encoding="utf-8")
+
+    check_style.cleanup_old_stream_results(tmp_path)
+    check_style.cleanup_old_stream_results(tmp_path / "missing")
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "20260102-000000-bbbbbb",
+        "20260103-000000-cccccc",
+        "zz-note.txt",
+    ]
+
+
+def test_list_queue_states_skips_non_state_entries_without_parsing(tmp_path):
+    check_style = _load_check_style_module()
+    queue_dir = tmp_path / "queue"
+    state_id = "d" * 64
+    check_style._write_json_atomically(queue_dir / f"100__pending__{state_id}.state.json", {"id": state_id})
+    (queue_dir / "notes.json").write_text("{}", encoding="utf-8")
+    (queue_dir / "sub.state.json").mkdir()
+
+    states = check_style._list_queue_states(queue_dir)
+
+    assert [(path.name, priority) for path, _data, priority, _status in states] == [
+        (f"100__pending__{state_id}.state.json", 100),
+    ]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_stream_worker_closes_inherited_descriptors(tmp_path, monkeypatch):
+    check_style = _load_check_style_module()
+    read_fd, write_fd = os.pipe()
+    marker = tmp_path / "worker-ran"
+
+    def fake_worker(args):
+        marker.write_text(str(os.path.exists(f"/proc/self/fd/{write_fd}")), encoding="utf-8")
+        os._exit(0)
+
+    monkeypatch.setattr(check_style, "main_stream_worker", fake_worker)
+    pid = os.fork()
+    if pid == 0:
+        try:
+            check_style._run_forked_stream_worker(
+                check_style.argparse.Namespace(), "stream", tmp_path / "worker.log",
+            )
+        finally:
+            os._exit(1)
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as reader:
+        assert reader.read() == b""
+    _pid, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert marker.read_text(encoding="utf-8") == "False"
@@ -79,7 +79,7 @@ def test_run_watch_mode_triggers_once_and_stops(monkeypatch):
     def fake_run(cmd, check=False, **kwargs):
         if isinstance(cmd, list) and cmd and cmd[0] != "git":
             calls["run"] += 1
-        return argparse.Namespace(returncode=0, stdout="", stderr="")
+        return argparse.Namespace(returncode=0, stdout=b"", stderr=b"")
 
     monkeypatch.setattr(check_style, "resolve_target_files", fake_resolve_target_files)
     monkeypatch.setattr(check_style.subprocess, "run", fake_run)
@@ -381,7 +381,7 @@ def test_run_watch_mode_passes_effective_queue_max_to_enqueue(monkeypatch):
     monkeypatch.setattr(check_style, "_update_watch_priority_stats", lambda root, files, priority: None)
     monkeypatch.setattr(check_style.time, "sleep", lambda _x: None)
     monkeypatch.setattr(check_style.time, "monotonic", lambda: 1.0)
-    monkeypatch.setattr(check_style.subprocess, "run", lambda *args, **kwargs: argparse.Namespace(returncode=0, stdout="", stderr=""))
+    monkeypatch.setattr(check_style.subprocess, "run", lambda *args, **kwargs: argparse.Namespace(returncode=0, stdout=b"", stderr=b""))
 
     captured = {"queue_max": None}
 